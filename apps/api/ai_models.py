@@ -0,0 +1,119 @@
+"""
+TrustCert AI - Guardian AI Model Backends (giả lập)
+
+Các backend chuyên dụng cho guardian: phân tích text, nhận diện ảnh và
+đánh giá rủi ro. Phần inference thật sẽ được nối vào sau; ở đây giữ đúng
+interface mà guardian.py sử dụng, với prefix cache cho phần system prompt
+tĩnh của text analyzer và risk engine.
+"""
+import os
+
+from .model_cache import model_cache
+from .prefix_cache import prefix_cache
+
+# onnxruntime chạy model rủi ro đã quantize INT8 (VNNI dot products trên
+# CPU mới: ~3-4x throughput so với FP32, băng thông bộ nhớ giảm một nửa)
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+RISK_MODEL_PATH = os.getenv("TRUSTCERT_RISK_MODEL", "models/risk.int8.onnx")
+
+# System prompt tĩnh - phần đắt nhất của prefill, cache được giữa các request
+TEXT_ANALYZER_SYSTEM_PROMPT = (
+    "Bạn là bộ phân tích tiền đề của Guardian AI. Trích xuất thực thể, "
+    "hành động và câu trả lời an toàn từ đầu vào của người dùng."
+)
+
+RISK_ENGINE_SYSTEM_PROMPT = (
+    "Bạn là cỗ máy đánh giá rủi ro của Guardian AI. Phân loại mức độ nguy "
+    "hiểm (SAFE/WARNING/CRITICAL) và đưa ra hướng dẫn an toàn."
+)
+
+
+class _TextAnalyzer:
+    """Phân tích tiền đề từ văn bản người dùng."""
+
+    async def extract_premise(self, user_text: str) -> dict:
+        # Prefill trên system prompt chỉ chạy một lần nhờ prefix cache
+        prefix_cache.get_or_prefill(TEXT_ANALYZER_SYSTEM_PROMPT, self._prefill)
+        # Giả lập: trích xuất thực thể/hành động đơn giản từ text
+        tokens = user_text.lower().split()
+        return {
+            "entities": tokens,
+            "action": tokens[0] if tokens else "",
+            "benign_answer": f"Phân tích: {user_text}",
+        }
+
+    def _prefill(self, prefix: str):
+        # Inference thật sẽ trả về KV tensors; giả lập trả về prompt đã nạp
+        return {"prompt": prefix, "prefilled": True}
+
+
+class _ImageAnalyzer:
+    """Nhận diện vật thể trong ảnh."""
+
+    MODEL_ID = "yolo-v8"
+
+    async def identify_objects(self, image_content) -> dict:
+        # Backend load qua BackendCache: cold-start một lần, LRU theo byte,
+        # lock per-entry serialize backend không-reentrant
+        handle = await model_cache.get_or_load(self.MODEL_ID, self._load_backend)
+        async with handle as backend:
+            # Giả lập: model vision thật (YOLO) sẽ được nối vào đây
+            return {"objects": [], "backend": backend["model"]}
+
+    def _load_backend(self):
+        return {"model": self.MODEL_ID, "loaded": True}
+
+
+class _RiskEngine:
+    """Đánh giá rủi ro dựa trên mâu thuẫn giữa tiền đề và bằng chứng."""
+
+    MODEL_ID = "risk-engine-int8"
+
+    async def evaluate(self, risk_input: dict) -> dict:
+        prefix_cache.get_or_prefill(RISK_ENGINE_SYSTEM_PROMPT, self._prefill)
+
+        # Model INT8 (nếu có) load qua BackendCache như mọi backend khác;
+        # quyết định dựa trên ngưỡng xác suất nên sai số quantization chấp nhận được
+        handle = await model_cache.get_or_load(self.MODEL_ID, self._load_backend)
+        async with handle as session:
+            if session is not None:
+                # Inference thật: session.run trên feature vector từ risk_input.
+                # Mapping đặc trưng sẽ được nối vào cùng model đã export.
+                pass
+
+        # Giả lập: rule đơn giản khi chưa có model
+        dangerous_objects = {"snake", "knife", "gun", "poison"}
+        obj = risk_input.get("object")
+        if isinstance(obj, str) and obj in dangerous_objects:
+            return {
+                "level": "CRITICAL",
+                "warning": f"Phát hiện vật thể nguy hiểm: {obj}",
+                "guidance": "Tránh xa và liên hệ chuyên gia",
+                "correction": "",
+            }
+        return {"level": "SAFE", "warning": "", "guidance": "", "correction": ""}
+
+    def _load_backend(self):
+        """Load ONNX session INT8: mỗi request một thread, nhiều request song song."""
+        if ort is None or not os.path.exists(RISK_MODEL_PATH):
+            return None
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        return ort.InferenceSession(
+            RISK_MODEL_PATH,
+            sess_options=options,
+            providers=['CPUExecutionProvider'],
+        )
+
+    def _prefill(self, prefix: str):
+        return {"prompt": prefix, "prefilled": True}
+
+
+# Instance dùng chung, đúng tên mà guardian.py import
+text_analyzer = _TextAnalyzer()
+image_analyzer = _ImageAnalyzer()
+risk_engine = _RiskEngine()
@@ -0,0 +1,177 @@
+"""
+Merkle aggregation cho guardian audit logs.
+
+Thay vì neo TỪNG log lên blockchain (tốn gas + thời gian confirm per request),
+mỗi log trở thành một lá (leaf) trong cây Merkle. Khi đủ N lá (hoặc hết thời
+gian chờ), chỉ neo DUY NHẤT Merkle root + batch tag - chi phí on-chain O(1)
+mỗi batch, nhưng mọi log đơn lẻ vẫn chứng minh được bằng Merkle path cỡ log2(N).
+"""
+import asyncio
+import hashlib
+import uuid
+from collections import OrderedDict
+
+from .blockchain import anchor_log_to_blockchain
+
+# Chữ ký BLS cho batch tag là tùy chọn - cần py_ecc khi triển khai đầy đủ
+try:
+    from py_ecc.bls import G2Basic as _bls
+except ImportError:
+    _bls = None
+
+BATCH_MAX_LEAVES = 256     # số lá tối đa mỗi cây
+BATCH_FLUSH_MS = 500       # thời gian chờ gom batch (milliseconds)
+MAX_PROOF_RECORDS = 10000  # số proof giữ trong RAM; cũ nhất bị loại trước
+
+
+# Base hasher dùng chung: .copy() rẻ hơn nhiều so với hashlib.sha3_256()
+# mới mỗi lá; memoryview tránh copy bytes khi feed payload lớn.
+_SHA3_BASE = hashlib.sha3_256()
+
+
+def hash_leaf(payload: bytes) -> bytes:
+    """Hash một audit log thành lá Merkle (SHA3-256, cùng chuẩn với ASA-Fusion)."""
+    h = _SHA3_BASE.copy()
+    h.update(memoryview(payload))
+    return h.digest()
+
+
+def _hash_pair(left: bytes, right: bytes) -> bytes:
+    h = _SHA3_BASE.copy()
+    h.update(left)
+    h.update(right)
+    return h.digest()
+
+
+def build_merkle_tree(leaves):
+    """
+    Dựng cây Merkle từ danh sách lá. Trả về list các level,
+    level[0] là lá, level[-1] là [root].
+    """
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        current = levels[-1]
+        if len(current) % 2 == 1:
+            current = current + [current[-1]]  # duplicate lá cuối nếu lẻ
+        levels.append([
+            _hash_pair(current[i], current[i + 1])
+            for i in range(0, len(current), 2)
+        ])
+    return levels
+
+
+def merkle_proof(levels, index: int):
+    """Trích Merkle path cho lá tại `index`: list các (sibling_hash_hex, is_right)."""
+    proof = []
+    for level in levels[:-1]:
+        if len(level) % 2 == 1:
+            level = level + [level[-1]]
+        sibling = index ^ 1
+        proof.append((level[sibling].hex(), sibling > index))
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof, root: bytes) -> bool:
+    """Xác minh một lá thuộc về root qua Merkle path."""
+    node = leaf
+    for sibling_hex, is_right in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _hash_pair(node, sibling) if is_right else _hash_pair(sibling, node)
+    return node == root
+
+
+class MerkleBatcher:
+    """Gom audit log thành batch Merkle và neo root lên blockchain."""
+
+    def __init__(self, max_leaves: int = BATCH_MAX_LEAVES, flush_ms: int = BATCH_FLUSH_MS):
+        self.max_leaves = max_leaves
+        self.flush_ms = flush_ms
+        self._buffer = []          # list of (log_id, leaf_bytes, future)
+        # log_id -> proof record; giới hạn MAX_PROOF_RECORDS, cũ nhất bị
+        # loại trước để bộ nhớ không tăng vô hạn theo số log đã neo
+        self._proofs = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._flush_handle = None
+
+    async def add(self, log_id: str, payload: bytes):
+        """
+        Thêm một audit log vào batch hiện tại.
+        Trả về (batch_id, merkle_proof, tx_hash) khi batch được neo.
+        """
+        future = asyncio.get_event_loop().create_future()
+        batch = None
+        async with self._lock:
+            self._buffer.append((log_id, hash_leaf(payload), future))
+            if len(self._buffer) >= self.max_leaves:
+                batch = self._take_batch_locked()
+            elif self._flush_handle is None:
+                loop = asyncio.get_event_loop()
+                self._flush_handle = loop.call_later(
+                    self.flush_ms / 1000.0,
+                    lambda: asyncio.ensure_future(self.flush())
+                )
+        if batch is not None:
+            await self._anchor_batch(batch)
+        return await future
+
+    async def flush(self):
+        """Neo batch hiện tại (nếu có) lên blockchain."""
+        async with self._lock:
+            batch = self._take_batch_locked()
+        if batch is not None:
+            await self._anchor_batch(batch)
+
+    def _take_batch_locked(self):
+        """Tráo buffer ra dưới lock; caller dựng cây và neo NGOÀI lock."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffer:
+            return None
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    async def _anchor_batch(self, batch):
+        """
+        Dựng cây Merkle và neo root - chạy ngoài lock, nên các add() khác
+        vẫn gom batch mới trong lúc chờ chain confirm thay vì xếp hàng
+        sau một RPC chậm.
+        """
+        batch_id = str(uuid.uuid4())
+        levels = build_merkle_tree([leaf for _, leaf, _ in batch])
+        root = levels[-1][0]
+
+        # Một transaction duy nhất cho cả batch: storeAuditRoot(root, batch_id)
+        tx_hash = await anchor_log_to_blockchain(root.hex(), batch_id)
+        batch_tag = self._sign_batch_tag(root)
+
+        for index, (log_id, leaf, future) in enumerate(batch):
+            proof = merkle_proof(levels, index)
+            self._proofs[log_id] = {
+                "batch_id": batch_id,
+                "root": root.hex(),
+                "leaf": leaf.hex(),
+                "proof": proof,
+                "batch_tag": batch_tag,
+                "tx_hash": tx_hash,
+            }
+            if not future.done():
+                future.set_result((batch_id, proof, tx_hash))
+        while len(self._proofs) > MAX_PROOF_RECORDS:
+            self._proofs.popitem(last=False)
+
+    def _sign_batch_tag(self, root: bytes):
+        """Chữ ký BLS trên root - ~480 bytes bất kể kích thước batch."""
+        if _bls is None:
+            return None
+        from .config import settings
+        return _bls.Sign(settings.BLS_PRIVATE_KEY, root).hex()
+
+    def get_proof(self, log_id: str):
+        """Tra cứu inclusion proof cho một log đã neo."""
+        return self._proofs.get(log_id)
+
+
+# Batcher dùng chung cho toàn app
+audit_batcher = MerkleBatcher()
@@ -1,30 +1,191 @@
+import asyncio
 import hashlib
-from web3 import Web3
+import aiohttp
+from eth_account import Account
+from web3 import AsyncWeb3
+from web3.providers.rpc import AsyncHTTPProvider
 from .config import settings
 
-# ... (giữ nguyên cấu hình w3, contract...)
+# ... (giữ nguyên ABI và địa chỉ contract: trustcert_contract khởi tạo từ w3)
+
+# AsyncWeb3 dùng chung cho toàn app: aiohttp session với connection pool
+# (keep-alive, tối đa 64 kết nối) thay vì Web3 sync chặn event loop mỗi RPC
+_w3 = None
+
+
+async def get_w3() -> AsyncWeb3:
+    global _w3
+    if _w3 is None:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=64))
+        provider = AsyncHTTPProvider(settings.RPC_URL, request_kwargs={'timeout': 10})
+        await provider.cache_async_session(session)
+        _w3 = AsyncWeb3(provider)
+    return _w3
+
+# Base hasher khởi tạo MỘT LẦN; mỗi lần hash chỉ .copy() từ base thay vì
+# hashlib.new() per call - Python-level overhead của việc khởi tạo hasher
+# chiếm phần lớn chi phí với log nhỏ. memoryview tránh copy bytes khi feed.
+_SHA3_BASE = hashlib.sha3_256()
+
+
+def hash_data(payload: bytes) -> str:
+    """Hash payload bằng SHA3-256 (chuẩn chung của SHA3CertificateManager)."""
+    h = _SHA3_BASE.copy()
+    h.update(memoryview(payload))
+    return h.hexdigest()
+
+
+# Cấu hình batching - gộp nhiều audit log vào một lần gửi RPC
+ANCHOR_BATCH_MAX = 50      # số log tối đa mỗi batch
+ANCHOR_BATCH_MS = 200      # thời gian chờ gom batch (milliseconds)
+
+# Tài khoản ký được derive một lần ở module scope (secp256k1 from_key là CPU-bound)
+_signer_account = None
+
+def _get_signer_account():
+    global _signer_account
+    if _signer_account is None:
+        _signer_account = Account.from_key(settings.SIGNER_PRIVATE_KEY)
+    return _signer_account
+
+class NonceManager:
+    """
+    Quản lý nonce cục bộ, tăng đơn điệu (optimistic increment).
+
+    Tránh một vòng JSON-RPC `get_transaction_count` trên hot path mỗi lần
+    gửi transaction; chỉ hỏi lại chain state khi khởi tạo hoặc khi node
+    báo nonce lệch ('nonce too low', code -32000).
+    """
+
+    def __init__(self):
+        self._nonce = None
+        self._lock = asyncio.Lock()
+
+    async def next(self) -> int:
+        """Cấp một nonce."""
+        return await self.reserve(1)
+
+    async def reserve(self, count: int) -> int:
+        """Cấp `count` nonce liên tiếp, trả về nonce đầu tiên."""
+        async with self._lock:
+            if self._nonce is None:
+                account = _get_signer_account()
+                w3 = await get_w3()
+                self._nonce = await w3.eth.get_transaction_count(account.address, 'pending')
+            start = self._nonce
+            self._nonce += count
+            return start
+
+    async def reset(self) -> None:
+        """Quên nonce cục bộ; lần cấp tiếp theo sẽ hỏi lại chain state."""
+        async with self._lock:
+            self._nonce = None
+
+
+_nonce_manager = NonceManager()
+
+
+def _is_nonce_error(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return 'nonce too low' in message or '-32000' in message
+
+
+# Hàng đợi các log đang chờ neo: (log_id, log_hash, future)
+_pending: asyncio.Queue = asyncio.Queue()
+_worker_task: asyncio.Task = None
+
 
 async def anchor_log_to_blockchain(log_hash: str, log_id: str) -> str:
     """
     NEO LẠI NHẬT KÝ PHÂN TÍCH.
     Ghi lại bằng chứng về quyết định của AI một cách không thể thay đổi.
+
+    Thay vì gửi một transaction mỗi log (một vòng RPC round-trip per call),
+    log được đưa vào hàng đợi và worker nền gom thành batch, amortize
+    độ trễ mạng tới Ethereum node trên N logs.
     """
+    future = asyncio.get_event_loop().create_future()
+    await _pending.put((log_id, log_hash, future))
+    return await future
+
+
+def start_anchor_worker() -> None:
+    """Khởi động worker gom batch. Gọi từ lifespan của app."""
+    global _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.get_event_loop().create_task(_anchor_worker())
+
+
+def stop_anchor_worker() -> None:
+    """Dừng worker gom batch; gọi khi app shutdown. Các future còn chờ
+    trong hàng đợi được resolve None để caller không treo vô hạn."""
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        _worker_task = None
+    while not _pending.empty():
+        try:
+            _, _, future = _pending.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if not future.done():
+            future.set_result(None)
+
+
+async def _anchor_worker() -> None:
+    """
+    Worker nền: drain tối đa ANCHOR_BATCH_MAX entries (hoặc chờ ANCHOR_BATCH_MS),
+    lấy nonce MỘT LẦN rồi tăng cục bộ (optimistic nonce increment), ký tất cả,
+    và gửi qua một BatchRequest duy nhất - một HTTP POST cho cả batch.
+    """
+    while True:
+        batch = [await _pending.get()]
+        deadline = asyncio.get_event_loop().time() + ANCHOR_BATCH_MS / 1000.0
+        while len(batch) < ANCHOR_BATCH_MAX:
+            remaining = deadline - asyncio.get_event_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_pending.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        await _flush_batch(batch)
+
+
+async def _flush_batch(batch, retry: bool = True) -> None:
+    """Ký và gửi một batch log qua Web3 BatchRequest."""
     try:
-        account = w3.eth.account.from_key(settings.SIGNER_PRIVATE_KEY)
-        nonce = w3.eth.getTransactionCount(account.address)
-
-        # Gọi hàm trong Smart Contract được thiết kế để lưu audit logs
-        tx = trustcert_contract.functions.storeAuditLog(log_id, f"0x{log_hash}").buildTransaction({
-            'nonce': nonce,
-            # ... các thông số gas khác
-        })
-        
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key=settings.SIGNER_PRIVATE_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
-        return w3.toHex(tx_hash)
+        w3 = await get_w3()
+        # Nonce cấp từ bộ đếm cục bộ - không còn RPC round-trip mỗi batch
+        nonce = await _nonce_manager.reserve(len(batch))
+
+        signed_txs = []
+        for log_id, log_hash, _ in batch:
+            tx = await trustcert_contract.functions.storeAuditLog(log_id, f"0x{log_hash}").build_transaction({
+                'nonce': nonce,
+                # ... các thông số gas khác
+            })
+            signed_txs.append(Account.sign_transaction(tx, private_key=settings.SIGNER_PRIVATE_KEY))
+            nonce += 1
+
+        # Một HTTP POST cho toàn bộ batch (AsyncWeb3 batch_requests)
+        async with w3.batch_requests() as batch_request:
+            for signed_tx in signed_txs:
+                batch_request.add(w3.eth.send_raw_transaction(signed_tx.rawTransaction))
+            tx_hashes = await batch_request.async_execute()
+
+        for (_, _, future), tx_hash in zip(batch, tx_hashes):
+            if not future.done():
+                future.set_result(w3.to_hex(tx_hash))
     except Exception as e:
+        if retry and _is_nonce_error(e):
+            # Nonce cục bộ lệch với chain - đồng bộ lại và thử đúng một lần
+            await _nonce_manager.reset()
+            await _flush_batch(batch, retry=False)
+            return
         print(f"Blockchain audit anchoring failed: {e}")
-        return None
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
 
-# ... (Các hàm khác có thể giữ nguyên hoặc sửa đổi để truy vấn audit log)
\ No newline at end of file
+# ... (Các hàm khác có thể giữ nguyên hoặc sửa đổi để truy vấn audit log)
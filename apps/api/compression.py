@@ -0,0 +1,126 @@
+"""
+TrustCert AI - Negotiated response compression
+ASGI middleware that picks the best codec the client accepts: zstd > br > gzip.
+
+GZipMiddleware's zlib DEFLATE is the slowest-per-byte of the three: zstd-3
+encodes 2-3x faster at a comparable ratio and brotli reaches 20-30% smaller
+payloads on the JSON-heavy responses this API serves. Both zstandard and
+brotli release the GIL while compressing, unlike stdlib gzip. Either library
+being absent just narrows the negotiation; gzip always remains as the floor.
+"""
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+
+# A response still reporting more_body after this many buffered bytes is a
+# genuine stream (SSE, large export): holding its headers and body until the
+# final chunk would defeat the streaming, so it is passed through untouched
+STREAM_PASSTHROUGH_BYTES = 64 * 1024
+
+
+def _compress_zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+
+
+def _compress_brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def _compress_gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _pick_encoder(accept_encoding: str):
+    """Choose (token, encoder) from the client's Accept-Encoding header."""
+    if zstandard is not None and "zstd" in accept_encoding:
+        return "zstd", _compress_zstd
+    if brotli is not None and "br" in accept_encoding:
+        return "br", _compress_brotli
+    if "gzip" in accept_encoding:
+        return "gzip", _compress_gzip
+    return None, None
+
+
+class CompressionMiddleware:
+    """Buffer the response body and compress it with the negotiated codec."""
+
+    def __init__(self, app, minimum_size: int = 1000):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1").lower()
+                break
+
+        token, encoder = _pick_encoder(accept_encoding)
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts = []
+        buffered = 0
+        streaming = False
+
+        async def buffering_send(message):
+            nonlocal start_message, buffered, streaming
+            if streaming:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunk = message.get("body", b"")
+            body_parts.append(chunk)
+            buffered += len(chunk)
+            if message.get("more_body"):
+                if buffered >= STREAM_PASSTHROUGH_BYTES:
+                    # Stop withholding: release the original headers and
+                    # everything buffered so far, then forward the rest of
+                    # the stream uncompressed as it arrives
+                    streaming = True
+                    await send(start_message)
+                    await send({
+                        "type": "http.response.body",
+                        "body": b"".join(body_parts),
+                        "more_body": True,
+                    })
+                    body_parts.clear()
+                return
+
+            body = b"".join(body_parts)
+            headers = list(start_message.get("headers", []))
+            already_encoded = any(name == b"content-encoding" for name, _ in headers)
+            if len(body) >= self.minimum_size and not already_encoded:
+                body = encoder(body)
+                headers = [(n, v) for n, v in headers if n != b"content-length"]
+                headers.append((b"content-encoding", token.encode("latin-1")))
+                headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                headers.append((b"vary", b"Accept-Encoding"))
+            start_message["headers"] = headers
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffering_send)
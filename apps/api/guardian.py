@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import os
+import time
 import uuid
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
 
 from .auth import get_current_user
-from .blockchain import hash_data, anchor_log_to_blockchain
+from .audit_batcher import audit_batcher
 # Giả lập các module AI chuyên dụng
 from .ai_models import image_analyzer, text_analyzer, risk_engine
 
@@ -13,6 +18,96 @@ router = APIRouter(
     tags=["Guardian AI - Cognitive Immunity"],
 )
 
+# orjson nhanh hơn ~5x stdlib json; brotli nén log rất hiệu quả (4-8x)
+# vì audit log lặp lại nhiều tên step/key. Cả hai đều là optional dependency.
+try:
+    import orjson
+    def _canonical_json(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    def _parse_json(payload: bytes):
+        return orjson.loads(payload)
+except ImportError:
+    import json
+    def _canonical_json(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    def _parse_json(payload: bytes):
+        return json.loads(payload)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BROTLI_QUALITY = 6
+
+# OpenCV/NumPy cho tiền xử lý ảnh là optional - thiếu thì đưa raw bytes cho model
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+# Pillow làm đường decode thay thế: draft() downsample ngay trong miền DCT
+# của libjpeg nên chỉ tốn ~1/4 công decode khi model cần input 640x640
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+MODEL_INPUT_SIZE = (640, 640)
+MAX_UPLOAD_BYTES = 8 << 20  # chặn upload quá khổ trước khi decode (chống DoS)
+
+# Pool process riêng cho JPEG decode + resize + normalize: CPU-bound,
+# không được phép chặn asyncio event loop của API
+_cpu_pool = None
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _cpu_pool
+
+
+def _decode_and_resize(image_bytes: bytes):
+    """Decode + resize + normalize ảnh. Chạy trong CPU pool, ngoài event loop."""
+    if cv2 is not None:
+        img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+        img = cv2.resize(img, MODEL_INPUT_SIZE)
+        return np.ascontiguousarray(img, dtype=np.float32) / 255.0
+    if Image is not None:
+        import io
+        img = Image.open(io.BytesIO(image_bytes))
+        # draft() để libjpeg decode sẵn ở 1/2 hoặc 1/4 resolution trong một lượt
+        img.draft('RGB', MODEL_INPUT_SIZE)
+        return img.convert('RGB').resize(MODEL_INPUT_SIZE)
+    return image_bytes
+
+
+def serialize_audit_log(audit_log: dict) -> bytes:
+    """
+    Serialize audit log thành dạng canonical (JSON sorted keys) rồi nén Brotli.
+    Canonical JSON đảm bảo verifier tái tạo được hash (str(dict) thì không);
+    payload nén dùng chung cho cả hashing lẫn lưu DB (BYTEA).
+    """
+    payload = _canonical_json(audit_log)
+    if brotli is not None:
+        payload = brotli.compress(payload, quality=BROTLI_QUALITY)
+    return payload
+
+
+def deserialize_audit_log(payload: bytes) -> dict:
+    """Giải nén + parse một audit log đã lưu (đường đọc lazy)."""
+    if brotli is not None:
+        payload = brotli.decompress(payload)
+    return _parse_json(payload)
+
+
+def ts_iso(ts_ns: int) -> str:
+    """Format ts_ns sang ISO-8601 - chỉ gọi ở presentation boundary cho verifier."""
+    from datetime import datetime, timezone
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
+
 # --- Models ---
 class SafetyDirective(BaseModel):
     level: str # e.g., "SAFE", "WARNING", "CRITICAL_ALERT"
@@ -22,9 +117,18 @@ class SafetyDirective(BaseModel):
     audit_log_id: str
     blockchain_tx_hash: Optional[str] = None
 
+# Template phản hồi dựng sẵn per level: (priority_action, message template).
+# Các khóa format lấy từ risk_assessment và text_premise.
+_RESPONSE_TEMPLATES = {
+    "CRITICAL": ("WARN_AND_ABORT", "!!! CẢNH BÁO KHẨN CẤP !!! {warning}. HƯỚNG DẪN: {guidance}"),
+    "WARNING": ("CORRECT_AND_ANSWER", "LƯU Ý: {correction}. {benign_answer}"),
+    "SAFE": ("ANSWER", "{benign_answer}"),
+}
+
 # --- CORE LOGIC ---
 @router.post("/analyze", response_model=SafetyDirective)
 async def analyze_interaction(
+    bg: BackgroundTasks,
     user_text: str = Form(...),
     image_file: Optional[UploadFile] = File(None),
     current_user: dict = Depends(get_current_user)
@@ -34,9 +138,11 @@ async def analyze_interaction(
     Nó không chỉ trả lời, nó BẢO VỆ.
     """
     audit_log = {
-        "log_id": str(uuid.uuid4()),
+        "log_id": uuid.uuid4().hex,
         "user": current_user['username'],
-        "timestamp": datetime.utcnow().isoformat(),
+        # time_ns: một số nguyên 64-bit, không allocate datetime + format chuỗi
+        # ISO per request; chỉ format ở presentation boundary (ts_iso)
+        "ts_ns": time.time_ns(),
         "user_input_text": user_text,
         "has_image": image_file is not None,
         "steps": []
@@ -49,8 +155,18 @@ async def analyze_interaction(
     
     image_evidence = None
     if image_file:
-        image_content = await image_file.read()
-        image_evidence = await image_analyzer.identify_objects(image_content)
+        # Đọc có giới hạn: không bao giờ kéo toàn bộ file quá khổ vào RAM
+        image_content = await image_file.read(MAX_UPLOAD_BYTES + 1)
+        if len(image_content) > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image exceeds maximum upload size of {MAX_UPLOAD_BYTES} bytes"
+            )
+        # Tiền xử lý CPU-bound chạy trong process pool; event loop chỉ chờ
+        # kết quả, còn bước inference (GPU) mới chạy trên đường async
+        loop = asyncio.get_event_loop()
+        model_input = await loop.run_in_executor(_get_cpu_pool(), _decode_and_resize, image_content)
+        image_evidence = await image_analyzer.identify_objects(model_input)
         audit_log["steps"].append({"step": "image_analysis", "result": image_evidence})
 
     # === BƯỚC 2: PHÁT HIỆN MÂU THUẪN & ĐÁNH GIÁ RỦI RO ===
@@ -64,15 +180,14 @@ async def analyze_interaction(
 
     # === BƯỚC 3: PHẢN HỒI DỰA TRÊN MỨC ĐỘ NGUY HIỂM (RISK-BASED RESPONSE) ===
     # Quy tắc tối cao: AN TOÀN > HỮU ÍCH
-    if risk_assessment["level"] == "CRITICAL":
-        response_message = f"!!! CẢNH BÁO KHẨN CẤP !!! {risk_assessment['warning']}. HƯỚNG DẪN: {risk_assessment['guidance']}"
-        priority_action = "WARN_AND_ABORT"
-    elif risk_assessment["level"] == "WARNING":
-        response_message = f"LƯU Ý: {risk_assessment['correction']}. {text_premise['benign_answer']}"
-        priority_action = "CORRECT_AND_ANSWER"
-    else: # SAFE
-        response_message = text_premise['benign_answer']
-        priority_action = "ANSWER"
+    # Template dựng sẵn per level: một dict lookup + format_map (C-implemented)
+    # thay cho chuỗi if/elif; ChainMap tra cả hai dict mà không copy
+    # .get với fallback SAFE: risk engine trả level lạ thì vẫn phản hồi
+    # được thay vì KeyError -> 500
+    priority_action, template = _RESPONSE_TEMPLATES.get(
+        risk_assessment["level"], _RESPONSE_TEMPLATES["SAFE"]
+    )
+    response_message = template.format_map(ChainMap(risk_assessment, text_premise))
         
     audit_log["final_decision"] = {
         "level": risk_assessment["level"], 
@@ -81,30 +196,127 @@ async def analyze_interaction(
     }
 
     # === BƯỚC 4: NIÊM PHONG BẰNG CHỨNG (IMMUTABLE AUDIT TRAIL) ===
-    # Hash toàn bộ nhật ký phân tích và neo lên blockchain
-    log_hash = hash_data(str(audit_log).encode('utf-8'))
-    tx_hash = await anchor_log_to_blockchain(log_hash, audit_log["log_id"])
-    audit_log["blockchain_tx_hash"] = tx_hash
+    # Tx hash không phải thành phần bảo mật của phản hồi, nên không bắt
+    # người dùng chờ neo on-chain: background task chỉ enqueue log vào
+    # Merkle batcher (batcher tự flush theo nhịp riêng), còn response trả
+    # ngay với TTFB = độ trễ inference. Client lấy proof + tx hash sau qua
+    # GET /guardian/audit/{log_id}/proof.
+    log_bytes = serialize_audit_log(audit_log)
+    bg.add_task(_seal_audit_log, audit_log["log_id"], log_bytes)
 
     # Lưu log đầy đủ vào DB (quan trọng cho việc truy vết và cải tiến model)
-    # save_log_to_db(audit_log)
+    # save_log_to_db(audit_log["log_id"], log_bytes)  # cột BYTEA, đã nén Brotli
 
-    return SafetyDirective(
+    # model_construct bỏ qua bước re-validate của pydantic - an toàn vì
+    # mọi field đều do server kiểm soát, không phải input người dùng
+    return SafetyDirective.model_construct(
         level=risk_assessment["level"],
         priority_action=priority_action,
         message_to_user=response_message,
         evidence_summary={"text_premise": text_premise, "image_evidence": image_evidence},
         audit_log_id=audit_log["log_id"],
-        blockchain_tx_hash=tx_hash
+        blockchain_tx_hash=None
     )
 
+
+async def _seal_audit_log(log_id: str, log_bytes: bytes) -> None:
+    """Background task: đưa log vào Merkle batcher và chờ batch được neo."""
+    await audit_batcher.add(log_id, log_bytes)
+
+@router.get("/audit/{log_id}/proof")
+async def get_audit_proof(log_id: str):
+    """
+    Trả về Merkle inclusion proof cho một audit log đã neo.
+    Verifier chỉ cần leaf + path + root on-chain để xác minh độc lập.
+    """
+    proof = audit_batcher.get_proof(log_id)
+    if proof is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No anchored proof found for log {log_id}"
+        )
+    return proof
+
+
 # --- Các hàm logic phụ (giả lập) ---
+
+# Bảng rule mâu thuẫn: id -> (regex thực thể user nhắc, regex vật thể trong ảnh, nhãn rủi ro).
+# Rule set sẽ lên tới hàng trăm cặp entity/object, nên toàn bộ vocabulary được
+# compile MỘT LẦN thành multi-pattern matcher quét một lượt thay vì hàng chục
+# phép `in` Python per request.
+CONTRADICTION_RULES = {
+    0: (r"\bworm\b", r"\bsnake\b", "snake"),
+    1: (r"\btoy\b|\bplastic\b", r"\bgun\b", "gun"),
+    2: (r"\bberry\b|\bfruit\b", r"\bmushroom\b", "mushroom"),
+}
+
+# Hyperscan (DFA SIMD, O(n) theo độ dài input) là optional; fallback là một
+# alternation regex duy nhất đã compile sẵn - vẫn một lượt quét per input.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+import re
+
+if hyperscan is not None:
+    def _build_db(pattern_index):
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[CONTRADICTION_RULES[rid][pattern_index].encode('utf-8')
+                         for rid in sorted(CONTRADICTION_RULES)],
+            ids=sorted(CONTRADICTION_RULES),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(CONTRADICTION_RULES),
+        )
+        return db
+
+    _ENTITY_DB = _build_db(0)
+    _OBJECT_DB = _build_db(1)
+
+    def _scan_rule_ids(db, buffer: str) -> set:
+        hits = set()
+        db.scan(buffer.encode('utf-8'), match_event_handler=lambda rid, *_: hits.add(rid))
+        return hits
+
+    def _scan_entities(buffer: str) -> set:
+        return _scan_rule_ids(_ENTITY_DB, buffer)
+
+    def _scan_objects(buffer: str) -> set:
+        return _scan_rule_ids(_OBJECT_DB, buffer)
+else:
+    def _build_re(pattern_index):
+        return re.compile(
+            "|".join(f"(?P<r{rid}>{CONTRADICTION_RULES[rid][pattern_index]})"
+                     for rid in sorted(CONTRADICTION_RULES)),
+            re.IGNORECASE,
+        )
+
+    _ENTITY_RE = _build_re(0)
+    _OBJECT_RE = _build_re(1)
+
+    def _scan_rule_ids(compiled, buffer: str) -> set:
+        return {int(m.lastgroup[1:]) for m in compiled.finditer(buffer)}
+
+    def _scan_entities(buffer: str) -> set:
+        return _scan_rule_ids(_ENTITY_RE, buffer)
+
+    def _scan_objects(buffer: str) -> set:
+        return _scan_rule_ids(_OBJECT_RE, buffer)
+
+
 def detect_contradiction(text, image):
-    # Logic so sánh ở đây. Ví dụ:
-    if image and "snake" in image["objects"] and "worm" in text["entities"]:
-        contradiction_details = "User mentions 'worm', but image clearly shows a 'snake'."
-        # Dữ liệu đầu vào cho cỗ máy rủi ro
-        risk_input = {"object": "snake", "user_action": text["action"]}
-        return contradiction_details, risk_input
+    if image:
+        # Một lượt quét multi-pattern mỗi phía, rồi giao hai tập rule id
+        entity_hits = _scan_entities(" ".join(text["entities"]))
+        object_hits = _scan_objects(" ".join(image["objects"]))
+        matched = entity_hits & object_hits
+        if matched:
+            risk_tag = CONTRADICTION_RULES[min(matched)][2]
+            contradiction_details = (
+                f"User's described entity contradicts the image, which clearly shows a '{risk_tag}'."
+            )
+            # Dữ liệu đầu vào cho cỗ máy rủi ro
+            risk_input = {"object": risk_tag, "user_action": text["action"]}
+            return contradiction_details, risk_input
     return "No significant contradiction.", {"object": text["entities"], "user_action": text["action"]}
 
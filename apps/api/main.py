@@ -1,9 +1,9 @@
+"""
 TrustCert AI v2.0 - Main Application Entry Point
 Enterprise-grade AI-powered certificate verification system
 """
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -25,12 +25,37 @@ from apps.api.routes import (
     blockchain,
     analytics
 )
+from apps.api.blockchain import start_anchor_worker, stop_anchor_worker
+from apps.api.compression import CompressionMiddleware
 from apps.api.utils.logger import setup_logger
-from apps.api.utils.metrics import metrics_middleware
+from apps.api.utils.metrics import metrics_middleware, metrics_app
+from apps.api.score_kernel import compute_score, score_batch, score_many, warm_start
+from pydantic import BaseModel, Field
+from typing import Annotated, List
 
 # Setup logging
 logger = setup_logger(__name__)
 
+# orjson serialization is ~5x faster than stdlib json (SIMD string escaping);
+# fall back to the stock JSONResponse when orjson is not installed
+try:
+    import orjson  # noqa: F401 - ORJSONResponse requires orjson at render time
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    DefaultResponse = JSONResponse
+
+
+def _schema_to_bytes(schema: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(schema)
+    import json
+    return json.dumps(schema, separators=(",", ":")).encode("utf-8")
+
+
+async def _openapi_bytes_endpoint(request: Request) -> Response:
+    return Response(request.app.state.openapi_bytes, media_type="application/json")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -44,13 +69,36 @@ async def lifespan(app: FastAPI):
     
     # Initialize Redis connection
     # await redis.connect()
-    
+
+    # Warm-start the scoring kernel so the JIT compile cost is paid once
+    # at boot instead of on the first /score/batch request
+    warm_start()
+
+    # Launch the background worker that batches audit-log anchors into
+    # single RPC roundtrips; anchor_log_to_blockchain futures only
+    # resolve once this is running
+    start_anchor_worker()
+
+    # Generate the OpenAPI schema once at startup: regeneration is O(100ms)
+    # of pure Python per /openapi.json hit otherwise. Internal callers hit
+    # the cached dict; the route itself serves pre-serialized bytes.
+    app.openapi_schema = app.openapi()
+    app.state.openapi_bytes = _schema_to_bytes(app.openapi_schema)
+    from starlette.routing import Route
+    for i, route in enumerate(app.router.routes):
+        if getattr(route, "path", None) == app.openapi_url:
+            app.router.routes[i] = Route(
+                app.openapi_url, _openapi_bytes_endpoint, include_in_schema=False
+            )
+            break
+
     logger.info("✅ All systems operational")
     
     yield
     
     # Shutdown
     logger.info("🛑 TrustCert AI shutting down...")
+    stop_anchor_worker()
     # await database.disconnect()
     # await redis.disconnect()
     logger.info("👋 Shutdown complete")
@@ -76,6 +124,7 @@ app = FastAPI(
     * Multi-signature verification
     """,
     version="2.0.0",
+    default_response_class=DefaultResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -104,8 +153,9 @@ app.add_middleware(
     expose_headers=["X-Request-ID", "X-Process-Time"],
 )
 
-# Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Compression: negotiates zstd > br > gzip from Accept-Encoding; zstd/brotli
+# encode faster and/or smaller than DEFLATE and release the GIL while doing it
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
 
 # Custom Middleware
 app.add_middleware(SecurityHeadersMiddleware)
@@ -115,6 +165,11 @@ app.add_middleware(RateLimitMiddleware)
 # Metrics Middleware
 app.middleware("http")(metrics_middleware)
 
+# Prometheus scrape endpoint (aggregates per-worker mmap shards when
+# PROMETHEUS_MULTIPROC_DIR is configured)
+if metrics_app is not None:
+    app.mount("/metrics", metrics_app)
+
 # ============= EXCEPTION HANDLERS =============
 
 @app.exception_handler(StarletteHTTPException)
@@ -211,6 +266,119 @@ async def version():
         "framework": "FastAPI 0.104.1",
     }
 
+# ============= TRUST SCORE ENDPOINTS =============
+
+class Features(BaseModel):
+    age_days: float
+    verified_ratio: float
+    activity_30d: float
+    reports_90d: float
+
+class ScoreBatchRequest(BaseModel):
+    # Exactly [age_days, verified_ratio, activity_30d, reports_90d] per row;
+    # short or ragged rows fail validation as a 422 instead of blowing up
+    # inside the transposed kernel as a 500
+    rows: List[Annotated[List[float], Field(min_length=4, max_length=4)]]
+
+# msgspec validates small structs with a hand-written C validator (10-30x
+# faster than pydantic on objects this size) and parses the body with a
+# SIMD JSON decoder; optional, the pydantic endpoint stays as the fallback
+try:
+    import msgspec
+
+    class _FeaturesStruct(msgspec.Struct):
+        age_days: float
+        verified_ratio: float
+        activity_30d: float
+        reports_90d: float
+
+    _decode_features = msgspec.json.Decoder(_FeaturesStruct).decode
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    @app.post("/score", summary="Compute Trust Score")
+    async def score(request: Request):
+        """Compute the trust score and bucket for a single feature vector"""
+        features = _decode_features(await request.body())
+        value, bucket = compute_score(
+            features.age_days,
+            features.verified_ratio,
+            features.activity_30d,
+            features.reports_90d,
+        )
+        return Response(
+            content=msgspec.json.encode({"score": value, "bucket": bucket}),
+            media_type="application/json",
+        )
+else:
+    @app.post("/score", summary="Compute Trust Score")
+    async def score(features: Features):
+        """Compute the trust score and bucket for a single feature vector"""
+        value, bucket = compute_score(
+            features.age_days,
+            features.verified_ratio,
+            features.activity_30d,
+            features.reports_90d,
+        )
+        return {"score": value, "bucket": bucket}
+
+@app.post("/score/batch", summary="Compute Trust Scores in Batch")
+async def score_batch_endpoint(payload: ScoreBatchRequest):
+    """
+    Score many feature vectors in one call.
+
+    Rows are [age_days, verified_ratio, activity_30d, reports_90d];
+    the batch is dispatched to the parallel JIT-compiled kernel.
+    """
+    scores, buckets = score_batch(payload.rows)
+    return {"scores": scores, "buckets": buckets}
+
+# pyarrow lets /score/bulk consume Arrow IPC uploads zero-copy; optional
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+FEATURE_COLUMNS = ("age_days", "verified_ratio", "activity_30d", "reports_90d")
+
+
+def _require_feature_columns(present) -> None:
+    """422 naming the first missing feature column, instead of a KeyError 500."""
+    for name in FEATURE_COLUMNS:
+        if name not in present:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Missing feature column: {name}",
+            )
+
+
+@app.post("/score/bulk", summary="Columnar Bulk Trust Scoring")
+async def score_bulk(request: Request):
+    """
+    Bulk scoring over columnar input for analytics backfills.
+
+    Accepts an Arrow IPC stream (content-type containing 'arrow') or JSON
+    columns {"age_days": [...], "verified_ratio": [...], ...}; columns are
+    fed straight to the vectorized SoA kernel without row-tuple conversion.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if pa is not None and "arrow" in content_type:
+        table = pa.ipc.open_stream(body).read_all()
+        _require_feature_columns(table.column_names)
+        columns = [table.column(name).to_numpy() for name in FEATURE_COLUMNS]
+    else:
+        import json
+        payload = json.loads(body)
+        _require_feature_columns(payload)
+        columns = [payload[name] for name in FEATURE_COLUMNS]
+    scores, buckets = score_many(*columns)
+    return {
+        "scores": scores.tolist() if hasattr(scores, "tolist") else scores,
+        "buckets": buckets.tolist() if hasattr(buckets, "tolist") else buckets,
+    }
+
 # ============= STARTUP MESSAGE =============
 
 if __name__ == "__main__":
@@ -223,5 +391,4 @@ if __name__ == "__main__":
         reload=settings.DEBUG,
         log_level="info",
         access_log=True,
-    )
-EOF
\ No newline at end of file
+    )
\ No newline at end of file
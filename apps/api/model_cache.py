@@ -0,0 +1,99 @@
+"""
+TrustCert AI - Model Backend Cache
+
+Guardian sẽ dùng ngày càng nhiều model (text, vision, risk, quantum,
+certify...). Cache backend theo LRU với ngân sách byte: cold-start chỉ
+trả một lần, RAM không phình vô hạn, và mỗi backend không-reentrant được
+serialize bằng lock riêng để hai request không chạy đè lên nhau.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Ngân sách cache theo MB (mặc định 24GB cho server inference)
+MODEL_CACHE_MB = int(os.getenv("TRUSTCERT_MODEL_CACHE_MB", str(24 * 1024)))
+
+
+class _CacheEntry:
+    """Một backend đã load cùng lock serialize truy cập."""
+
+    def __init__(self, backend: Any, size_bytes: int):
+        self.backend = backend
+        self.size_bytes = size_bytes
+        self.lock = asyncio.Lock()
+
+
+class BackendHandle:
+    """
+    Handle giữ backend sống kể cả khi entry đã bị evict khỏi map
+    (eviction chỉ xóa khỏi map, không hủy backend đang dùng).
+    """
+
+    def __init__(self, entry: _CacheEntry):
+        self._entry = entry
+
+    async def __aenter__(self):
+        await self._entry.lock.acquire()
+        return self._entry.backend
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._entry.lock.release()
+
+
+class BackendCache:
+    """LRU cache giới hạn theo byte cho các model backend."""
+
+    def __init__(self, max_bytes: int = MODEL_CACHE_MB * (1 << 20)):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = asyncio.Lock()
+
+    async def get_or_load(
+        self,
+        model_id: str,
+        loader: Callable[[], Any],
+        size_bytes: int = 0
+    ) -> BackendHandle:
+        """
+        Lấy handle cho backend, load nếu chưa có trong cache.
+
+        Args:
+            model_id: ID của model (ví dụ 'yolo-v8')
+            loader: Hàm load backend khi cache miss
+            size_bytes: Kích thước backend (tổng .safetensors) để tính eviction
+        """
+        async with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None:
+                self._entries.move_to_end(model_id)
+                return BackendHandle(entry)
+
+        # Load ngoài lock để không chặn các model khác
+        backend = loader()
+        entry = _CacheEntry(backend, size_bytes)
+
+        async with self._lock:
+            existing = self._entries.get(model_id)
+            if existing is not None:
+                # Request khác đã load xong trước - dùng bản của họ
+                return BackendHandle(existing)
+            self._entries[model_id] = entry
+            self._total_bytes += entry.size_bytes
+            # Evict LRU khi vượt ngân sách; handle đang mở vẫn giữ backend sống
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size_bytes
+        return BackendHandle(entry)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self._total_bytes,
+            "budget_bytes": self.max_bytes,
+        }
+
+
+# Cache dùng chung cho mọi model backend của guardian
+model_cache = BackendCache()
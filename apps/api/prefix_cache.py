@@ -0,0 +1,81 @@
+"""
+TrustCert AI - Prompt Prefix Cache
+
+Mỗi lần gọi /guardian/analyze, text analyzer và risk engine đều chạy lại
+prefill trên cùng một system prompt tĩnh rất dài. Cache KV-state của phần
+prefix tĩnh (keyed theo hash của prompt) để TTFT chỉ còn phụ thuộc phần
+suffix động của từng request.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Ngân sách cache theo MB (mặc định 512MB)
+PREFIX_CACHE_MB = int(os.getenv("TRUSTCERT_PREFIX_CACHE_MB", "512"))
+
+
+def prefix_id(prefix: str) -> str:
+    """ID ổn định cho một static prefix (blake2b hex)."""
+    return hashlib.blake2b(prefix.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class PrefixCache:
+    """
+    LRU cache giới hạn theo byte cho KV-state đã prefill.
+
+    `get_or_prefill` trả về state đã cache nếu prefix từng được prefill;
+    nếu chưa, chạy `prefill` một lần và giữ lại kết quả. Các prompt chia sẻ
+    prefix (risk engine vs text analyzer) hit chung một entry.
+    """
+
+    def __init__(self, max_bytes: int = PREFIX_CACHE_MB * (1 << 20)):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (state, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_prefill(
+        self,
+        prefix: str,
+        prefill: Callable[[str], Any],
+        size_hint: int = 0
+    ) -> Any:
+        """
+        Lấy KV-state cho prefix, chạy prefill nếu cache miss.
+
+        Args:
+            prefix: System prompt tĩnh
+            prefill: Hàm chạy prefill khi miss (nhận prefix, trả state)
+            size_hint: Kích thước state (bytes) để tính ngân sách eviction
+        """
+        key = prefix_id(prefix)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        state = prefill(prefix)
+        size = size_hint or len(prefix.encode('utf-8'))
+
+        with self._lock:
+            self._entries[key] = (state, size)
+            self._total_bytes += size
+            # Evict LRU khi vượt ngân sách
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+        return state
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "budget_bytes": self.max_bytes,
+            }
+
+
+# Cache dùng chung cho mọi model backend
+prefix_cache = PrefixCache()
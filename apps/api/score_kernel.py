@@ -0,0 +1,131 @@
+"""
+TrustCert AI - Trust Score Kernels
+Batch scoring math compiled with Numba when available, with NumPy and
+pure-Python fallbacks so the API degrades gracefully without either.
+"""
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# AOT-compiled kernel built by build_aot.py during the Docker image build:
+# same math as the JIT path but imported as a ready .so, so workers pay no
+# JIT compile cost on boot. Preferred over JIT when present.
+try:
+    from trustcert_kernels import score_batch as _aot_score_batch
+except ImportError:
+    _aot_score_batch = None
+
+# Scoring weights (shared by scalar, NumPy and Numba paths)
+W_AGE = 0.25
+W_VERIFIED = 0.35
+W_ACTIVITY = 0.30
+W_REPORTS = 0.20
+AGE_NORM_DAYS = 365.0
+
+BUCKET_THRESHOLDS = (0.40, 0.65, 0.85)
+BUCKET_LABELS = ("D", "C", "B", "A")
+
+
+def bucket_for(score: float) -> str:
+    """Map a score in [0, 1] to its trust bucket."""
+    idx = 0
+    for threshold in BUCKET_THRESHOLDS:
+        if score >= threshold:
+            idx += 1
+    return BUCKET_LABELS[idx]
+
+
+def compute_score(age_days: float, verified_ratio: float,
+                  activity_30d: float, reports_90d: float) -> Tuple[float, str]:
+    """Scalar scoring path for single-request `/score` calls."""
+    score = (
+        W_AGE * (age_days / AGE_NORM_DAYS)
+        + W_VERIFIED * verified_ratio
+        + W_ACTIVITY * activity_30d
+        - W_REPORTS * reports_90d
+    )
+    score = 0.0 if score < 0.0 else (1.0 if score > 1.0 else score)
+    return score, bucket_for(score)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_batch_kernel(age, vr, a30, r90, out):  # pragma: no cover - needs numba
+        for i in prange(age.shape[0]):
+            s = 0.25 * age[i] / 365.0 + 0.35 * vr[i] + 0.30 * a30[i] - 0.20 * r90[i]
+            out[i] = 0.0 if s < 0.0 else (1.0 if s > 1.0 else s)
+
+
+def score_many(age, vr, a30, r90):
+    """
+    Columnar (SoA) scoring path: four contiguous float32 columns in, a
+    (scores, buckets) array pair out. One fused vector op over 8 FP32
+    lanes per AVX2 instruction instead of one row tuple at a time; feed
+    columns straight from Arrow/Parquet record batches to avoid any
+    AoS-to-SoA copy.
+    """
+    if np is None:
+        scores = []
+        buckets = []
+        for row in zip(age, vr, a30, r90):
+            score, bucket = compute_score(*row)
+            scores.append(score)
+            buckets.append(bucket)
+        return scores, buckets
+
+    age = np.ascontiguousarray(age, dtype=np.float32)
+    vr = np.ascontiguousarray(vr, dtype=np.float32)
+    a30 = np.ascontiguousarray(a30, dtype=np.float32)
+    r90 = np.ascontiguousarray(r90, dtype=np.float32)
+    out = np.empty(age.shape[0], dtype=np.float32)
+
+    if _aot_score_batch is not None:
+        _aot_score_batch(age, vr, a30, r90, out)
+    elif NUMBA_AVAILABLE:
+        _score_batch_kernel(age, vr, a30, r90, out)
+    else:
+        np.clip(
+            W_AGE * age / AGE_NORM_DAYS + W_VERIFIED * vr
+            + W_ACTIVITY * a30 - W_REPORTS * r90,
+            0.0, 1.0, out=out
+        )
+
+    bucket_idx = np.searchsorted(np.asarray(BUCKET_THRESHOLDS, dtype=np.float32), out, side='right')
+    return out, np.asarray(BUCKET_LABELS)[bucket_idx]
+
+
+def score_batch(rows: Sequence[Sequence[float]]) -> Tuple[List[float], List[str]]:
+    """
+    Score many feature vectors at once.
+
+    Rows are [age_days, verified_ratio, activity_30d, reports_90d].
+    Dispatches to the JIT-compiled parallel kernel when Numba is installed,
+    to vectorized NumPy when only NumPy is, and to the scalar path otherwise.
+    """
+    if np is not None and rows:
+        # Transpose AoS rows once into SoA columns for the vector path
+        cols = np.ascontiguousarray(np.asarray(rows, dtype=np.float32).T)
+        scores, buckets = score_many(cols[0], cols[1], cols[2], cols[3])
+        return scores.tolist(), buckets.tolist()
+
+    scores = []
+    buckets = []
+    for row in rows:
+        score, bucket = compute_score(row[0], row[1], row[2], row[3])
+        scores.append(score)
+        buckets.append(bucket)
+    return scores, buckets
+
+
+def warm_start() -> None:
+    """Pay the one-time JIT compile cost at startup instead of first request."""
+    score_batch([[100.0, 0.5, 0.5, 0.1]])
@@ -0,0 +1,63 @@
+"""
+TrustCert AI - Prometheus request metrics
+Multi-process-safe counters for multi-worker uvicorn/gunicorn deployments.
+
+Plain prometheus_client Counter/Histogram objects are per-process: under
+`--workers N` every worker keeps its own numbers and a scrape only sees one
+of them. With PROMETHEUS_MULTIPROC_DIR set, prometheus_client switches to an
+mmap'd backing store per worker (packed doubles written with struct.pack_into,
+which releases the GIL) and the collector reduces across the shards at scrape
+time, so the numbers are both correct and cheap to update on the hot path.
+"""
+import os
+import time
+
+try:
+    from prometheus_client import (
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        make_asgi_app,
+        multiprocess,
+    )
+except ImportError:
+    Counter = None
+
+if Counter is not None:
+    _multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if _multiproc_dir:
+        os.makedirs(_multiproc_dir, exist_ok=True)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = None  # single-process: default global registry
+
+    REQUEST_COUNT = Counter(
+        "trustcert_http_requests_total",
+        "Total HTTP requests",
+        ["method", "path", "status"],
+    )
+    REQUEST_DURATION = Histogram(
+        "trustcert_http_request_duration_seconds",
+        "HTTP request latency",
+        ["method", "path"],
+    )
+
+    # ASGI app for GET /metrics, built from the multiprocess registry when
+    # one is configured so a scrape aggregates every worker's shard
+    metrics_app = make_asgi_app(registry=registry) if registry is not None else make_asgi_app()
+
+    async def metrics_middleware(request, call_next):
+        """Count and time every request; labels use the route path template."""
+        start = time.perf_counter()
+        response = await call_next(request)
+        path = request.scope.get("route").path if request.scope.get("route") else request.url.path
+        REQUEST_COUNT.labels(request.method, path, response.status_code).inc()
+        REQUEST_DURATION.labels(request.method, path).observe(time.perf_counter() - start)
+        return response
+else:
+    # prometheus_client not installed: metrics become a no-op passthrough
+    metrics_app = None
+
+    async def metrics_middleware(request, call_next):
+        return await call_next(request)
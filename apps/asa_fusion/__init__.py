@@ -27,11 +27,27 @@ from .exceptions import (
     BatchProcessingError
 )
 
+from .analyzer import (
+    ProblemType,
+    AnalysisResult,
+    ProblemAnalyzer
+)
+
 from .crypto import (
     Certificate,
     SHA3CertificateManager
 )
 
+from .core import (
+    SolverResult,
+    DecisionProcedure,
+    DiophantineProcedure,
+    PresburgerProcedure,
+    Z3Solver,
+    ProcedureRegistry,
+    create_default_registry
+)
+
 from .plugins import (
     DecisionResult,
     DecisionPlugin,
@@ -81,9 +97,21 @@ __all__ = [
     "PluginError",
     "SolverError",
     "BatchProcessingError",
+    # Analyzer
+    "ProblemType",
+    "AnalysisResult",
+    "ProblemAnalyzer",
     # Crypto
     "Certificate",
     "SHA3CertificateManager",
+    # Core
+    "SolverResult",
+    "DecisionProcedure",
+    "DiophantineProcedure",
+    "PresburgerProcedure",
+    "Z3Solver",
+    "ProcedureRegistry",
+    "create_default_registry",
     # Plugins
     "DecisionResult",
     "DecisionPlugin",
@@ -0,0 +1,123 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+ASA-Fusion v2.0 - Compiled Diophantine fast path
+Hand-written scanner for linear Diophantine equations a*x + b*y = c.
+
+Optional extension: build with `cythonize -i apps/asa_fusion/_diophantine.pyx`.
+core.py falls back to the regex + math.gcd path when the module is absent.
+"""
+
+
+cdef unsigned long long _binary_gcd(unsigned long long a, unsigned long long b):
+    """Stein's binary GCD on unsigned machine words."""
+    cdef int shift = 0
+    if a == 0:
+        return b
+    if b == 0:
+        return a
+    while ((a | b) & 1) == 0:
+        a >>= 1
+        b >>= 1
+        shift += 1
+    while (a & 1) == 0:
+        a >>= 1
+    while b != 0:
+        while (b & 1) == 0:
+            b >>= 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+cdef Py_ssize_t _skip_spaces(str s, Py_ssize_t i, Py_ssize_t n):
+    while i < n and s[i] == ' ':
+        i += 1
+    return i
+
+
+cdef tuple _read_term(str s, Py_ssize_t i, Py_ssize_t n):
+    """Read [digits] ['*'] letter; returns (coefficient, next_index) or None."""
+    cdef long long coeff = 0
+    cdef bint have_digits = False
+    i = _skip_spaces(s, i, n)
+    while i < n and '0' <= s[i] <= '9':
+        coeff = coeff * 10 + (ord(s[i]) - 48)
+        have_digits = True
+        i += 1
+    if not have_digits:
+        coeff = 1
+    i = _skip_spaces(s, i, n)
+    if i < n and s[i] == '*':
+        i = _skip_spaces(s, i + 1, n)
+    if i >= n or not ('a' <= s[i] <= 'z'):
+        return None
+    i += 1
+    # Multi-letter identifiers are not single variables; reject
+    if i < n and 'a' <= s[i] <= 'z':
+        return None
+    return coeff, i
+
+
+cpdef tuple decide_linear(str s):
+    """
+    Decide a*x + b*y = c via the gcd criterion.
+
+    Args:
+        s: Whitespace-normalized, lowercase equation
+
+    Returns:
+        (solvable, a, b, c, gcd) or None when s is not of that shape
+    """
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t n = len(s)
+    cdef long long a, b, c
+    cdef bint negate_a = False
+    cdef bint negate_b = False
+    cdef bint negate_c = False
+    cdef unsigned long long g
+
+    i = _skip_spaces(s, i, n)
+    if i < n and s[i] == '-':
+        negate_a = True
+        i += 1
+    term = _read_term(s, i, n)
+    if term is None:
+        return None
+    a, i = term
+    if negate_a:
+        a = -a
+
+    i = _skip_spaces(s, i, n)
+    if i >= n or (s[i] != '+' and s[i] != '-'):
+        return None
+    negate_b = s[i] == '-'
+    term = _read_term(s, i + 1, n)
+    if term is None:
+        return None
+    b, i = term
+    if negate_b:
+        b = -b
+
+    i = _skip_spaces(s, i, n)
+    if i >= n or s[i] != '=':
+        return None
+    i = _skip_spaces(s, i + 1, n)
+    if i < n and s[i] == '-':
+        negate_c = True
+        i += 1
+    if i >= n or not ('0' <= s[i] <= '9'):
+        return None
+    c = 0
+    while i < n and '0' <= s[i] <= '9':
+        c = c * 10 + (ord(s[i]) - 48)
+        i += 1
+    if negate_c:
+        c = -c
+    if _skip_spaces(s, i, n) != n:
+        return None
+
+    if a == 0 and b == 0:
+        return c == 0, a, b, c, 0
+    g = _binary_gcd(a if a >= 0 else -a, b if b >= 0 else -b)
+    return c % (<long long> g) == 0, a, b, c, <long long> g
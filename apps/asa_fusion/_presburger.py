@@ -0,0 +1,452 @@
+"""
+ASA-Fusion v2.0 - Presburger Quantifier Elimination
+Cooper-style variable elimination for conjunctions of linear integer
+constraints, so formulas in the Presburger fragment are decided here in
+microseconds instead of falling through to the SMT backend, which pays
+SMT-LIB parsing and context setup per call.
+
+Scope is the honest subset the rest of the pipeline actually produces:
+quantifier-free conjunctions (`and`-separated) of linear relations over
+integer variables, with every free variable read existentially — i.e. a
+satisfiability check. Formulas outside the grammar, or whose elimination
+blows past the size caps, report "unsupported" and the caller falls back
+to the general solver.
+"""
+
+import re
+from functools import lru_cache
+from math import gcd, lcm
+from typing import Dict, List, Optional, Tuple
+
+# Optional Numba kernel for the minus-infinity shift scan: the d in
+# [0, delta) enumeration is pure integer arithmetic, and for the large
+# deltas modular constraints produce, the JIT-compiled loop avoids a
+# PyObject allocation per iteration. cache=True persists the compile.
+try:
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _admissible_shift_kernel(coefs, consts, moduli, delta):  # pragma: no cover - needs numba
+        for j in range(delta):
+            ok = True
+            for i in range(coefs.shape[0]):
+                if (coefs[i] * j + consts[i]) % moduli[i] != 0:
+                    ok = False
+                    break
+            if ok:
+                return j
+        return -1
+
+    _NUMBA_SHIFT = True
+except ImportError:
+    _NUMBA_SHIFT = False
+
+# Below this the JIT call/array setup costs more than the Python loop
+_NUMBA_SHIFT_MIN_DELTA = 64
+
+# Elimination can multiply out disjunctions (boundary points x delta
+# shifts per variable); past these caps the specialized path concedes to
+# the general solver rather than grinding through an exponential blowup
+_MAX_CONJUNCTS = 256
+_MAX_DELTA = 256
+
+# Atom ops: coefs.x + const OP 0, or modulus | coefs.x + const
+_LE, _EQ, _NE, _DIV = 0, 1, 2, 3
+
+# An atom is (op, coefs, const, modulus); coefs maps var -> int and is
+# never stored with zero entries, modulus is None except for _DIV
+_Atom = Tuple[int, Dict[str, int], int, Optional[int]]
+
+_TOKEN = re.compile(
+    r'\s*(?:(\d+)|([a-z][a-z0-9_]*)|(<=|>=|!=|[<>=+\-*,])|(\S))'
+)
+
+_REL_OPS = {'<=', '>=', '!=', '=', '<', '>'}
+
+
+class CooperUnsupported(Exception):
+    """Formula outside the supported fragment or past the size caps."""
+
+
+def _tokenize(text: str) -> List[str]:
+    text = text.strip()
+    tokens = []
+    pos = 0
+    for match in _TOKEN.finditer(text):
+        if match.start() != pos:
+            raise CooperUnsupported("unexpected character")
+        pos = match.end()
+        if match.group(4) is not None:
+            raise CooperUnsupported(f"unexpected character {match.group(4)!r}")
+        tokens.append(match.group(1) or match.group(2) or match.group(3))
+    if pos != len(text):
+        raise CooperUnsupported("unexpected character")
+    return tokens
+
+
+def _parse_side(tokens: List[str], i: int) -> Tuple[Dict[str, int], int, int]:
+    """Parse a linear sum starting at tokens[i]; returns (coefs, const, next_i)."""
+    coefs: Dict[str, int] = {}
+    const = 0
+    expect_term = True
+    sign = 1
+    while i < len(tokens):
+        tok = tokens[i]
+        if expect_term:
+            if tok == '-':
+                sign = -sign
+                i += 1
+                continue
+            if tok == '+':
+                i += 1
+                continue
+            coef = sign
+            if tok.isdigit():
+                coef = sign * int(tok)
+                i += 1
+                if i < len(tokens) and tokens[i] == '*':
+                    i += 1
+                    if i >= len(tokens) or not tokens[i][0].isalpha():
+                        raise CooperUnsupported("expected variable after *")
+                    tok = tokens[i]
+                else:
+                    const += coef
+                    expect_term = False
+                    sign = 1
+                    continue
+            elif not tok[0].isalpha():
+                raise CooperUnsupported(f"unexpected token {tok!r}")
+            coefs[tok] = coefs.get(tok, 0) + coef
+            i += 1
+            expect_term = False
+            sign = 1
+        else:
+            if tok in ('+', '-'):
+                sign = 1 if tok == '+' else -1
+                i += 1
+                expect_term = True
+            else:
+                break
+    if expect_term:
+        raise CooperUnsupported("dangling operator")
+    return {v: c for v, c in coefs.items() if c}, const, i
+
+
+def _parse_relation(tokens: List[str], i: int) -> Tuple[_Atom, int]:
+    lhs_coefs, lhs_const, i = _parse_side(tokens, i)
+    if i >= len(tokens) or tokens[i] not in _REL_OPS:
+        raise CooperUnsupported("expected relational operator")
+    op_tok = tokens[i]
+    rhs_coefs, rhs_const, i = _parse_side(tokens, i + 1)
+    # Normalize to coefs.x + const OP 0 with OP in {<=, =, !=}
+    coefs = dict(lhs_coefs)
+    for var, coef in rhs_coefs.items():
+        coefs[var] = coefs.get(var, 0) - coef
+    coefs = {v: c for v, c in coefs.items() if c}
+    const = lhs_const - rhs_const
+    if op_tok in ('>', '>='):
+        coefs = {v: -c for v, c in coefs.items()}
+        const = -const
+        op_tok = '<' if op_tok == '>' else '<='
+    if op_tok == '<':
+        const += 1
+        op_tok = '<='
+    op = {'<=': _LE, '=': _EQ, '!=': _NE}[op_tok]
+    return (op, coefs, const, None), i
+
+
+def parse_conjunction(problem: str) -> List[_Atom]:
+    """
+    Parse an and-separated conjunction of linear integer relations.
+
+    Args:
+        problem: Formula text, e.g. "2*x + 3*y = 12 and x >= 0"
+
+    Returns:
+        List of normalized atoms
+
+    Raises:
+        CooperUnsupported: If the text falls outside the grammar
+    """
+    tokens = _tokenize(problem.lower())
+    atoms: List[_Atom] = []
+    i = 0
+    while i < len(tokens):
+        atom, i = _parse_relation(tokens, i)
+        atoms.append(atom)
+        if i < len(tokens):
+            if tokens[i] not in ('and', ','):
+                raise CooperUnsupported("expected conjunction")
+            i += 1
+            if i >= len(tokens):
+                raise CooperUnsupported("dangling conjunction")
+    if not atoms:
+        raise CooperUnsupported("empty formula")
+    return atoms
+
+
+def _substitute(atom: _Atom, var: str, expr_coefs: Dict[str, int],
+                expr_const: int) -> Optional[_Atom]:
+    """
+    Replace var with a linear expression inside atom; ground atoms
+    evaluate immediately (None = true and dropped, raising is not used —
+    a false ground atom is signalled by the caller dropping the conjunct).
+    """
+    op, coefs, const, modulus = atom
+    coef = coefs.get(var)
+    if coef is None:
+        return atom
+    new_coefs = {v: c for v, c in coefs.items() if v != var}
+    for v, c in expr_coefs.items():
+        merged = new_coefs.get(v, 0) + coef * c
+        if merged:
+            new_coefs[v] = merged
+        elif v in new_coefs:
+            del new_coefs[v]
+    return (op, new_coefs, const + coef * expr_const, modulus)
+
+
+def _ground_value(atom: _Atom) -> Optional[bool]:
+    """Truth value of a variable-free atom, or None if it still has vars."""
+    op, coefs, const, modulus = atom
+    if coefs:
+        return None
+    if op == _LE:
+        return const <= 0
+    if op == _EQ:
+        return const == 0
+    if op == _NE:
+        return const != 0
+    return const % modulus == 0
+
+
+def _simplify(atoms: List[_Atom]) -> Optional[List[_Atom]]:
+    """Drop ground-true atoms; None if any ground atom is false."""
+    out = []
+    for atom in atoms:
+        value = _ground_value(atom)
+        if value is None:
+            out.append(atom)
+        elif value is False:
+            return None
+    return out
+
+
+def _split_disequalities(atoms: List[_Atom]) -> List[List[_Atom]]:
+    """Case-split t != 0 into t <= -1 or -t <= -1, producing a DNF list."""
+    conjuncts = [[]]
+    for atom in atoms:
+        op, coefs, const, _ = atom
+        if op != _NE:
+            for conjunct in conjuncts:
+                conjunct.append(atom)
+            continue
+        negated = ({v: -c for v, c in coefs.items()}, -const)
+        expanded = []
+        for conjunct in conjuncts:
+            expanded.append(conjunct + [(_LE, coefs, const + 1, None)])
+            expanded.append(conjunct + [(_LE, negated[0], negated[1] + 1, None)])
+        conjuncts = expanded
+        if len(conjuncts) > _MAX_CONJUNCTS:
+            raise CooperUnsupported("disequality split too large")
+    return conjuncts
+
+
+def _admissible_shift(div_atoms: List[_Atom], var: str, delta: int) -> int:
+    """
+    First shift j in [0, delta) satisfying every var-only divisibility
+    atom, or -1. Dispatches to the Numba kernel when it is available and
+    delta is large enough to pay for the array setup.
+    """
+    coefs = [a[1][var] for a in div_atoms]
+    consts = [a[2] for a in div_atoms]
+    moduli = [a[3] for a in div_atoms]
+    if _NUMBA_SHIFT and delta >= _NUMBA_SHIFT_MIN_DELTA:
+        return int(_admissible_shift_kernel(
+            np.asarray(coefs, dtype=np.int64),
+            np.asarray(consts, dtype=np.int64),
+            np.asarray(moduli, dtype=np.int64),
+            delta
+        ))
+    for j in range(delta):
+        if all((c * j + k) % m == 0
+               for c, k, m in zip(coefs, consts, moduli)):
+            return j
+    return -1
+
+
+def _eliminate_var(atoms: List[_Atom], var: str) -> List[List[_Atom]]:
+    """
+    Eliminate one existential variable from a conjunction (Cooper).
+
+    Returns the equivalent disjunction of conjunctions over the
+    remaining variables.
+    """
+    rest = [a for a in atoms if var not in a[1]]
+    with_var = [a for a in atoms if var in a[1]]
+    if not with_var:
+        return [atoms]
+
+    # Equality shortcut: a unit-coefficient equation pins the variable,
+    # so substitute instead of running the boundary/delta enumeration
+    for atom in with_var:
+        op, coefs, const, _ = atom
+        if op == _EQ and abs(coefs[var]) == 1:
+            coef = coefs[var]
+            # var = -(const + rest-of-coefs) / coef with coef = +-1
+            expr_coefs = {v: -c * coef for v, c in coefs.items() if v != var}
+            expr_const = -const * coef
+            substituted = [
+                _substitute(a, var, expr_coefs, expr_const)
+                for a in atoms if a is not atom
+            ]
+            simplified = _simplify(substituted)
+            return [] if simplified is None else [simplified]
+
+    # Step 1: scale every atom so var's coefficient is +-M, rename
+    # M*var -> y (unit coefficient) and record the divisibility M | y
+    scale = lcm(*(abs(a[1][var]) for a in with_var))
+    scaled: List[_Atom] = []
+    for op, coefs, const, modulus in with_var:
+        factor = scale // abs(coefs[var])
+        if factor != 1:
+            coefs = {v: c * factor for v, c in coefs.items()}
+            const *= factor
+            if modulus is not None:
+                modulus *= factor
+        coefs = dict(coefs)
+        coefs[var] = coefs[var] // scale  # +-1
+        scaled.append((op, coefs, const, modulus))
+    if scale != 1:
+        scaled.append((_DIV, {var: 1}, 0, scale))
+
+    # Equalities become a <= pair so only <= and | remain; disequalities
+    # were split away before elimination started
+    normalized: List[_Atom] = []
+    for op, coefs, const, modulus in scaled:
+        if op == _EQ:
+            normalized.append((_LE, coefs, const, None))
+            normalized.append((_LE, {v: -c for v, c in coefs.items()},
+                               -const, None))
+        elif op == _NE:
+            raise CooperUnsupported("disequality reached elimination")
+        else:
+            normalized.append((op, coefs, const, modulus))
+
+    # Step 2: delta = lcm of divisibility moduli; boundary set B from the
+    # lower bounds (atoms of shape -y + r <= 0, i.e. y >= r)
+    delta = 1
+    lower_bounds: List[Tuple[Dict[str, int], int]] = []
+    for op, coefs, const, modulus in normalized:
+        if op == _DIV:
+            delta = lcm(delta, modulus)
+        elif coefs[var] == -1:
+            lower_bounds.append((
+                {v: c for v, c in coefs.items() if v != var}, const
+            ))
+    if delta > _MAX_DELTA:
+        raise CooperUnsupported("divisibility lcm too large")
+
+    # Step 3: either no lower bound exists and only divisibility atoms
+    # constrain y as it walks to minus infinity, or y lands on some
+    # boundary b + j with j in [0, delta)
+    disjuncts: List[List[_Atom]] = []
+    if not lower_bounds:
+        div_atoms = [a for a in normalized if a[0] == _DIV]
+        if all(len(a[1]) == 1 for a in div_atoms):
+            # Every divisibility atom is over var alone, so each
+            # admissible shift yields the identical disjunct `rest`; one
+            # scan for any admissible j replaces the per-j rebuild
+            if _admissible_shift(div_atoms, var, delta) >= 0:
+                disjuncts.append(rest)
+        else:
+            for j in range(delta):
+                substituted = [_substitute(a, var, {}, j) for a in div_atoms]
+                simplified = _simplify(substituted)
+                if simplified is not None:
+                    disjuncts.append(rest + simplified)
+    else:
+        for bound_coefs, bound_const in lower_bounds:
+            for j in range(delta):
+                substituted = [
+                    _substitute(a, var, bound_coefs, bound_const + j)
+                    for a in normalized
+                ]
+                simplified = _simplify(substituted)
+                if simplified is not None:
+                    disjuncts.append(rest + simplified)
+                if len(disjuncts) > _MAX_CONJUNCTS:
+                    raise CooperUnsupported("boundary expansion too large")
+    return disjuncts
+
+
+# a*x + b*y = c, the shape the Diophantine callers overwhelmingly send;
+# Bezout decides it from one gcd instead of two eliminations
+_TWO_TERM_EQ = re.compile(
+    r'^(-?\d+)\s*\*\s*([a-z]\w*)\s*([+-])\s*(\d+)\s*\*\s*([a-z]\w*)\s*=\s*(-?\d+)$'
+)
+
+# Formulas above this size bypass the decision memo so a handful of
+# large strings cannot pin megabytes in the cache (same concern as
+# validation.py's _SCAN_CACHE_MAX_CHARS)
+_MEMO_MAX_CHARS = 4096
+
+
+def decide_formula(problem: str) -> Optional[bool]:
+    """
+    Decide satisfiability of a conjunction of linear integer constraints.
+
+    All free variables are read existentially. Short formulas are cached
+    like the Diophantine body: registry retries and portfolio races
+    re-submit identical formulas. Oversized ones skip the memo.
+
+    Args:
+        problem: Formula text
+
+    Returns:
+        True (sat) / False (unsat), or None when the formula is outside
+        the supported fragment or elimination exceeded the size caps
+    """
+    if len(problem) <= _MEMO_MAX_CHARS:
+        return _decide_formula_cached(problem)
+    return _decide_formula(problem)
+
+
+@lru_cache(maxsize=2048)
+def _decide_formula_cached(problem: str) -> Optional[bool]:
+    return _decide_formula(problem)
+
+
+def _decide_formula(problem: str) -> Optional[bool]:
+    m = _TWO_TERM_EQ.match(problem.strip())
+    if m and m.group(2) != m.group(5):
+        a, b, c = int(m.group(1)), int(m.group(4)), int(m.group(6))
+        if m.group(3) == '-':
+            b = -b
+        g = gcd(a, b)
+        return c % g == 0 if g else c == 0
+    try:
+        atoms = parse_conjunction(problem)
+        conjuncts = _split_disequalities(atoms)
+        simplified = []
+        for conjunct in conjuncts:
+            kept = _simplify(conjunct)
+            if kept is not None:
+                simplified.append(kept)
+        conjuncts = simplified
+        while conjuncts:
+            # Finished conjunct (everything ground-true): satisfiable
+            if any(not conjunct for conjunct in conjuncts):
+                return True
+            variables = sorted({v for c in conjuncts for a in c for v in a[1]})
+            var = variables[0]
+            expanded: List[List[_Atom]] = []
+            for conjunct in conjuncts:
+                expanded.extend(_eliminate_var(conjunct, var))
+                if len(expanded) > _MAX_CONJUNCTS:
+                    raise CooperUnsupported("elimination blowup")
+            conjuncts = expanded
+        return False
+    except CooperUnsupported:
+        return None
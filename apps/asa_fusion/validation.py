@@ -4,10 +4,100 @@ Comprehensive input validation with security checks.
 """
 
 import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from dataclasses import dataclass
 
 from .exceptions import ValidationError, SecurityError
+from .exceptions import TimeoutError as ASATimeoutError
+
+# Optional hyperscan backend: for large inputs its SIMD multi-pattern DFA
+# beats the backtracking re engine by a wide margin; absence just means
+# every scan takes the fused-alternation path
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional numpy for vectorized scans over large inputs
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    # +1 for openers, -1 for closers; depth is a cumulative sum
+    _DEPTH_DELTA = np.zeros(256, dtype=np.int8)
+    _DEPTH_DELTA[[40, 91, 123]] = 1   # ( [ {
+    _DEPTH_DELTA[[41, 93, 125]] = -1  # ) ] }
+
+# Below this the numpy round-trip costs more than the scalar walk
+_NUMPY_MIN_CHARS = 256
+
+# Deletion table for sanitization: C0 controls (minus tab/newline), DEL
+# and the C1 range — one C-level translate pass replaces the per-char
+# printable filter for everything except exotic unicode unprintables
+_SANITIZE_TABLE = {code: None for code in range(32) if code not in (9, 10)}
+_SANITIZE_TABLE[0x7f] = None
+_SANITIZE_TABLE.update(dict.fromkeys(range(0x80, 0xa0), None))
+
+_HS_THREAT_NAMES = ("sql", "xss", "path")
+_HS_THREAT_DB = None
+if hyperscan is not None:
+    try:
+        _HS_THREAT_DB = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        _HS_THREAT_DB.compile(
+            expressions=[
+                rb"\b(SELECT|UNION|INSERT|UPDATE|DELETE|DROP)\b",
+                rb"<script|javascript:|onerror=|onload=",
+                rb"\.\./|\.\.\\",
+            ],
+            ids=[0, 1, 2],
+            # SINGLEMATCH: one hit per pattern is all a raise needs, so
+            # the scanner stops reporting after the first occurrence
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * 3
+        )
+    except Exception:
+        _HS_THREAT_DB = None
+
+# Below this size the re pass wins; hyperscan pays an encode + FFI setup
+_HS_MIN_CHARS = 4096
+
+# Inputs above this size bypass the security-scan memo so a handful of
+# large strings cannot pin megabytes in the cache
+_SCAN_CACHE_MAX_CHARS = 4096
+
+
+@contextmanager
+def timeout_context(seconds: float):
+    """
+    Cooperative deadline scope based on a monotonic clock.
+
+    SIGALRM-style timeouts only work on the main thread and pay two
+    syscalls per scope; a monotonic deadline is safe under the threaded
+    solver paths and costs one clock read to set up. The scope yields a
+    check callable for long loops to poll, and the deadline is verified
+    once more on exit.
+
+    Args:
+        seconds: Time budget for the scope
+
+    Raises:
+        TimeoutError: If the deadline has passed at a check or on exit
+    """
+    deadline = time.monotonic() + seconds
+
+    def check() -> None:
+        if time.monotonic() > deadline:
+            raise ASATimeoutError(
+                f"Operation exceeded {seconds}s budget", timeout_seconds=seconds
+            )
+
+    yield check
+    check()
 
 
 @dataclass
@@ -22,27 +112,119 @@ class ValidationRule:
 class InputValidator:
     """Comprehensive input validator with security hardening."""
     
-    # Security patterns
-    SQL_INJECTION_PATTERN = re.compile(
-        r"(\bSELECT\b|\bUNION\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b|\bDROP\b)",
+    # Security patterns fused into one alternation: the re engine makes a
+    # single pass over the input instead of three sequential scans, and the
+    # named group that matched identifies the threat class
+    THREAT_PATTERN = re.compile(
+        r"(?P<sql>\bSELECT\b|\bUNION\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b|\bDROP\b)"
+        r"|(?P<xss><script|javascript:|onerror=|onload=)"
+        r"|(?P<path>\.\./|\.\.\\)",
         re.IGNORECASE
     )
+
+    _THREAT_MESSAGES = {
+        "sql": "Potential SQL injection detected in {field}",
+        "xss": "Potential XSS attack detected in {field}",
+        "path": "Potential path traversal detected in {field}",
+    }
     
-    XSS_PATTERN = re.compile(
-        r"<script|javascript:|onerror=|onload=",
-        re.IGNORECASE
-    )
-    
-    PATH_TRAVERSAL_PATTERN = re.compile(r"\.\./|\.\.\\")
-    
+    # Deeply nested brackets are a cheap way to blow up downstream parsers
+    MAX_NESTING_DEPTH = 100
+
+    # A single character repeated this often is a flood, not a formula
+    MAX_CHAR_REPEATS = 10000
+
     def __init__(self, max_input_size: int = 1048576):  # 1MB default
         """
         Initialize validator.
-        
+
         Args:
             max_input_size: Maximum input size in bytes
         """
         self.max_input_size = max_input_size
+        # Retry paths and solver portfolios revalidate identical inputs;
+        # a clean scan memoizes to a dict hit. Per-instance cache, same
+        # pattern as the signature cache in crypto. Scans that raise are
+        # not cached, so rejected inputs always re-raise correctly.
+        self._cached_scan = lru_cache(maxsize=1024)(self._scan_security_threats)
+
+    def check_nesting_depth(
+        self,
+        value: str,
+        max_depth: Optional[int] = None,
+        field_name: str = "input"
+    ) -> None:
+        """
+        Reject input whose bracket nesting exceeds max_depth.
+
+        str.count runs at C speed, and total opener count bounds the
+        depth, so the common case never enters the per-character walk.
+
+        Args:
+            value: String to check
+            max_depth: Depth limit; defaults to MAX_NESTING_DEPTH
+            field_name: Field name for error messages
+
+        Raises:
+            ValidationError: If nesting is too deep
+        """
+        if max_depth is None:
+            max_depth = self.MAX_NESTING_DEPTH
+        openers = value.count('(') + value.count('[') + value.count('{')
+        if openers <= max_depth:
+            return
+        if np is not None and len(value) >= _NUMPY_MIN_CHARS:
+            # One vectorized pass: LUT gather, cumulative sum, max. The
+            # table stays int8, but the sum accumulates in int32 - an int8
+            # cumsum wraps at depth 127 and silently under-reports deeper
+            # nesting for any max_depth >= 127
+            arr = np.frombuffer(value.encode('utf-8', 'ignore'), dtype=np.uint8)
+            deepest = int(_DEPTH_DELTA[arr].cumsum(dtype=np.int32).max(initial=0))
+            if deepest > max_depth:
+                raise ValidationError(
+                    f"{field_name} exceeds maximum nesting depth of {max_depth}"
+                )
+            return
+        depth = 0
+        for char in value:
+            if char in '([{':
+                depth += 1
+                if depth > max_depth:
+                    raise ValidationError(
+                        f"{field_name} exceeds maximum nesting depth of {max_depth}"
+                    )
+            elif char in ')]}':
+                depth -= 1
+
+    def has_excessive_repetition(
+        self,
+        value: str,
+        threshold: Optional[int] = None
+    ) -> bool:
+        """
+        Check whether any single character floods the input.
+
+        Args:
+            value: String to check
+            threshold: Repeat limit; defaults to MAX_CHAR_REPEATS
+
+        Returns:
+            True if some character occurs more than threshold times
+        """
+        if threshold is None:
+            threshold = self.MAX_CHAR_REPEATS
+        if len(value) <= threshold:
+            return False
+        if np is not None:
+            # ASCII-dominated inputs reduce to one bincount over uint8;
+            # multi-byte codepoints only ever split into more distinct
+            # bytes, so a miss here is authoritative
+            arr = np.frombuffer(value.encode('utf-8'), dtype=np.uint8)
+            if int(np.bincount(arr, minlength=256).max()) <= threshold:
+                return False
+            if arr.max() < 128:
+                return True
+        return max(Counter(value).values()) > threshold
     
     def validate_string(
         self,
@@ -163,11 +345,14 @@ class InputValidator:
             )
         
         if item_type:
-            for idx, item in enumerate(value):
-                if not isinstance(item, item_type):
-                    raise ValidationError(
-                        f"{field_name}[{idx}] must be of type {item_type.__name__}"
-                    )
+            # all() short-circuits in C on the happy path; the enumerate
+            # loop only runs on failure, to name the offending index
+            if not all(isinstance(item, item_type) for item in value):
+                for idx, item in enumerate(value):
+                    if not isinstance(item, item_type):
+                        raise ValidationError(
+                            f"{field_name}[{idx}] must be of type {item_type.__name__}"
+                        )
         
         return value
     
@@ -184,27 +369,106 @@ class InputValidator:
         """
         if not isinstance(value, str):
             return
-        
-        # Check for SQL injection
-        if self.SQL_INJECTION_PATTERN.search(value):
+        if len(value) <= _SCAN_CACHE_MAX_CHARS:
+            self._cached_scan(value, field_name)
+        else:
+            self._scan_security_threats(value, field_name)
+
+    def check_security_threats_batch(
+        self,
+        values: List[str],
+        field_name: str = "input"
+    ) -> None:
+        """
+        Scan a batch of strings with one pass over their concatenation.
+
+        Every check except bracket depth only gains evidence when items
+        are joined - a flagged item always flags the join - so a clean
+        scan of the join clears the whole batch with one traversal of
+        the pattern machinery instead of one per item. The RS sentinel
+        between items stops a threat pattern assembling across a
+        boundary, and a join flagged by accumulation alone (the same
+        character flooding across items, or the combined size) is
+        cleared by the per-item rescan.
+
+        Args:
+            values: Strings to check; non-string entries are skipped
+            field_name: Field name for error messages
+
+        Raises:
+            SecurityError: If any single item carries a threat
+            ValidationError: If any single item nests too deeply
+        """
+        strings = [value for value in values if isinstance(value, str)]
+        if len(strings) <= 1:
+            for value in strings:
+                self.check_security_threats(value, field_name)
+            return
+        # Bracket depth is not monotone under concatenation - an item's
+        # depth shifts by whatever imbalance precedes it - so it always
+        # runs per item; the opener-count bound keeps that to a few
+        # C-level counts each
+        for value in strings:
+            self.check_nesting_depth(value, field_name=field_name)
+        blob = "\x1e".join(dict.fromkeys(strings))
+        try:
+            self._scan_security_threats(blob, field_name)
+        except (SecurityError, ValidationError):
+            # Attribute the finding (or clear a join artifact): the
+            # per-item path re-raises with the offending item's message
+            for value in strings:
+                self.check_security_threats(value, field_name)
+
+    def _scan_security_threats(self, value: str, field_name: str) -> None:
+        """Uncached scan body behind check_security_threats' memo."""
+        # Embedded nulls never belong in legitimate input; count is one
+        # C-level pass and almost always zero
+        if value.count('\x00'):
             raise SecurityError(
-                f"Potential SQL injection detected in {field_name}"
+                f"Null byte detected in {field_name}"
             )
-        
-        # Check for XSS
-        if self.XSS_PATTERN.search(value):
+
+        self.check_nesting_depth(value, field_name=field_name)
+
+        if self.has_excessive_repetition(value):
             raise SecurityError(
-                f"Potential XSS attack detected in {field_name}"
+                f"Excessive character repetition detected in {field_name}"
             )
-        
-        # Check for path traversal
-        if self.PATH_TRAVERSAL_PATTERN.search(value):
-            raise SecurityError(
-                f"Potential path traversal detected in {field_name}"
+
+        # One scan covers SQL injection, XSS and path traversal; large
+        # inputs go through the hyperscan database when it is available
+        if _HS_THREAT_DB is not None and len(value) >= _HS_MIN_CHARS:
+            hits = []
+
+            def _on_match(pattern_id, start, end, flags, context=None):
+                hits.append(pattern_id)
+                return 1  # first hit is enough
+
+            _HS_THREAT_DB.scan(
+                value.encode('utf-8', 'ignore'), match_event_handler=_on_match
             )
-        
-        # Check input size
-        if len(value.encode('utf-8')) > self.max_input_size:
+            if hits:
+                raise SecurityError(
+                    self._THREAT_MESSAGES[_HS_THREAT_NAMES[hits[0]]].format(
+                        field=field_name
+                    )
+                )
+        else:
+            match = self.THREAT_PATTERN.search(value)
+            if match:
+                raise SecurityError(
+                    self._THREAT_MESSAGES[match.lastgroup].format(field=field_name)
+                )
+
+        # Size check via cheap bounds first: a char encodes to 1-4 UTF-8
+        # bytes, so the character count brackets the byte length and the
+        # full encode (an allocation the size of the input) only runs when
+        # the bounds disagree
+        n = len(value)
+        if n > self.max_input_size or (
+            n * 4 > self.max_input_size
+            and len(value.encode('utf-8')) > self.max_input_size
+        ):
             raise SecurityError(
                 f"{field_name} exceeds maximum size of {self.max_input_size} bytes"
             )
@@ -253,11 +517,20 @@ class InputValidator:
         """
         if not isinstance(value, str):
             return value
-        
-        # Remove null bytes
-        value = value.replace('\x00', '')
-        
-        # Remove control characters except newline and tab
-        value = ''.join(char for char in value if char.isprintable() or char in '\n\t')
-        
+
+        # Overwhelmingly common case: nothing to remove. One C-level scan
+        # skips the translate copy entirely
+        if value.isprintable():
+            return value.strip()
+
+        # Strip nulls and control characters in one translate pass
+        value = value.translate(_SANITIZE_TABLE)
+
+        # The table covers ASCII and C1 controls; only inputs that still
+        # carry unicode unprintables need the per-char filter
+        if not value.replace('\t', '').replace('\n', '').isprintable():
+            value = ''.join(
+                char for char in value if char.isprintable() or char in '\n\t'
+            )
+
         return value.strip()
@@ -3,13 +3,132 @@ ASA-Fusion v2.0 - WebAssembly Interface
 WebAssembly-ready design with interface definitions for WASM integration.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+import io
 import json
+import struct
 
+# Optional orjson codec: the C encoder returns bytes directly, so the
+# boundary skips both the pure-Python encode loop and the utf-8
+# round-trip; absence just means the stdlib path below
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# Optional ijson for partial deserialization: the incremental parser can
+# stop at the requested field instead of materializing a whole payload
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Fixed-layout certificate header, precompiled once: little-endian
+# timestamp plus the two payload lengths. Encoding a certificate is one
+# C-level pack call and two byte joins — no codec pass at all — and the
+# frame is 16 header bytes plus the raw payloads.
+_CERT_HDR = struct.Struct('<dII')
+
+
+# Precompiled stdlib codec objects for the fallback path: json.dumps and
+# json.loads construct encoder/decoder instances internally per call.
+# Minified separators drop the space padding from every payload crossing
+# the boundary, and ensure_ascii=False keeps non-ASCII text as utf-8
+# instead of 6-byte \uXXXX escapes.
+_JSON_ENCODER = json.JSONEncoder(
+    default=str, separators=(',', ':'), ensure_ascii=False
+)
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _encode_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return _JSON_ENCODER.encode(data).encode('utf-8')
+
+
+# Exact-type dispatch for the boundary: one dict lookup sends the common
+# payload types down a direct path, so the default=str callback never
+# runs for them. Strings stay on the JSON path on purpose — raw utf-8
+# would not round-trip through deserialize_from_wasm. Unlisted types
+# (including bool, which is deliberately not matched by the int entry)
+# fall through to the generic encoder.
+_ENCODERS = {
+    bytes: bytes,
+    # Pre-serialized buffers hand off as views: a bytearray or an exotic
+    # memoryview shape reaches the linear-memory write without the copy
+    # that bytes() would take
+    bytearray: lambda b: memoryview(b).cast('B'),
+    memoryview: lambda m: m.cast('B'),
+    dict: _encode_json,
+    list: _encode_json,
+    int: lambda i: str(i).encode(),
+    float: lambda f: repr(f).encode(),
+}
+
+
+def iter_batch_frames(buffer: bytes) -> Iterator[bytes]:
+    """
+    Split a batched boundary buffer back into its payload frames.
+
+    Args:
+        buffer: Concatenation of length-prefixed frames as built by
+            WasmInterface.batch()
+
+    Yields:
+        Each payload in submission order
+    """
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        length = int.from_bytes(buffer[offset:offset + 4], 'little')
+        offset += 4
+        yield bytes(buffer[offset:offset + length])
+        offset += length
+
+
+@lru_cache(maxsize=16)
+def _build_wasm_context(memory_pages: int) -> MappingProxyType:
+    """Build (once per page count) a shared read-only execution context."""
+    return MappingProxyType({
+        "memory_pages": memory_pages,
+        "memory_size_bytes": memory_pages << 16,
+        "stack_size": 1 << 20,  # 1MB stack
+        # Whatever the 1MB stack leaves over; never negative — fewer
+        # than 16 pages just means a heapless context, not a heap that
+        # downstream allocators would treat as a reallocation hint
+        "heap_size": max(0, (memory_pages << 16) - (1 << 20))
+    })
+
+
+class _WasmBatch:
+    """Accumulator for payloads that will cross the boundary together."""
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def submit(self, data: Any) -> None:
+        """
+        Queue one payload; it is serialized now but shipped on flush.
+
+        Args:
+            data: Data to serialize into the batch buffer
+        """
+        payload = WasmInterface.serialize_for_wasm(data)
+        self._buffer += len(payload).to_bytes(4, 'little')
+        self._buffer += payload
+
+
+# Slotted and frozen: registries hold many of these, and a fixed record
+# drops the per-instance __dict__ and its attribute-lookup indirection
+@dataclass(slots=True, frozen=True)
 class WasmModule:
     """WebAssembly module metadata."""
     name: str
@@ -43,6 +162,14 @@ class WasmInterface:
     
     def __init__(self):
         self._modules: Dict[str, WasmModule] = {}
+        # Warm instance handles keyed by (name, version): real engines
+        # pay module load/deserialization per instantiation, so the
+        # handle is built once and reused; a re-registered module gets a
+        # new version key and misses naturally
+        self._instances: Dict[tuple, Dict[str, Any]] = {}
+        # Snapshot for list_modules, rebuilt lazily after registration:
+        # polling callers would otherwise pay an O(n) copy per call
+        self._modules_snapshot: Optional[tuple] = ()
     
     def register_module(self, module: WasmModule) -> None:
         """
@@ -52,7 +179,8 @@ class WasmInterface:
             module: WasmModule to register
         """
         self._modules[module.name] = module
-    
+        self._modules_snapshot = None
+
     def get_module(self, name: str) -> Optional[WasmModule]:
         """
         Get registered WASM module.
@@ -65,27 +193,59 @@ class WasmInterface:
         """
         return self._modules.get(name)
     
-    def list_modules(self) -> List[WasmModule]:
+    def instantiate_module(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a warm instance handle for a registered module.
+
+        First use builds the handle (module plus its execution context);
+        later uses return the cached one, the same shape as wasmtime's
+        serialized-module cache. A backend wiring in a real engine
+        should build its instance here and keep the caching.
+
+        Args:
+            name: Module name
+
+        Returns:
+            Instance handle dict, or None if the module is unknown
+        """
+        module = self._modules.get(name)
+        if module is None:
+            return None
+        key = (name, module.version)
+        handle = self._instances.get(key)
+        if handle is None:
+            handle = {
+                "module": module,
+                "context": self.create_wasm_context(module.memory_pages)
+            }
+            self._instances[key] = handle
+        return handle
+
+    def list_modules(self) -> tuple:
         """List all registered WASM modules."""
-        return list(self._modules.values())
+        snapshot = self._modules_snapshot
+        if snapshot is None:
+            snapshot = self._modules_snapshot = tuple(self._modules.values())
+        return snapshot
     
     @staticmethod
     def serialize_for_wasm(data: Any) -> bytes:
         """
         Serialize Python data for WASM consumption.
-        
+
         Args:
             data: Data to serialize
-            
+
         Returns:
-            Serialized bytes
+            Serialized bytes, or a zero-copy memoryview when the input
+            is already a buffer
         """
-        if isinstance(data, bytes):
-            return data
-        
-        # Convert to JSON and then to bytes
-        json_str = json.dumps(data, default=str)
-        return json_str.encode('utf-8')
+        encoder = _ENCODERS.get(type(data))
+        if encoder is not None:
+            return encoder(data)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return memoryview(data).cast('B')
+        return _encode_json(data)
     
     @staticmethod
     def deserialize_from_wasm(data: bytes) -> Any:
@@ -100,30 +260,95 @@ class WasmInterface:
         """
         if not data:
             return None
-        
+
         try:
-            json_str = data.decode('utf-8')
-            return json.loads(json_str)
-        except (UnicodeDecodeError, json.JSONDecodeError):
-            # Return raw bytes if not JSON
+            if orjson is not None:
+                return orjson.loads(data)
+            return _JSON_DECODER.decode(data.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            # Return raw bytes if not JSON (orjson's JSONDecodeError and
+            # the stdlib's are both ValueError subclasses)
             return data
     
+    @staticmethod
+    def deserialize_field(data: bytes, field: str) -> Any:
+        """
+        Pull one top-level field out of a JSON payload from WASM.
+
+        With ijson available the incremental parse short-circuits once
+        the field has been read, so a large sibling value (an embedded
+        model, say) is never materialized; otherwise this falls back to
+        a full parse plus key lookup.
+
+        Args:
+            data: Bytes from WASM
+            field: Top-level key to extract
+
+        Returns:
+            The field's value, or None if absent or not a JSON object
+        """
+        if not data:
+            return None
+        if ijson is not None:
+            try:
+                for value in ijson.items(io.BytesIO(data), field):
+                    return value
+            except ijson.JSONError:
+                return None
+            return None
+        obj = WasmInterface.deserialize_from_wasm(data)
+        if isinstance(obj, dict):
+            return obj.get(field)
+        return None
+
+    @contextmanager
+    def batch(self):
+        """
+        Accumulate payloads and cross the boundary once on exit.
+
+        Each serialize-and-call round trip pays the boundary cost; for
+        bursts of small payloads the crossing dominates, so the batch
+        handle length-prefixes them into one contiguous buffer and
+        dispatch_batch ships it in a single call. The receiving side
+        splits it with iter_batch_frames.
+
+        Yields:
+            Handle whose submit(data) queues a payload
+        """
+        handle = _WasmBatch()
+        try:
+            yield handle
+        finally:
+            if handle._buffer:
+                self.dispatch_batch(bytes(handle._buffer))
+
+    def dispatch_batch(self, buffer: bytes) -> None:
+        """
+        Ship one batched buffer across the boundary.
+
+        The metadata-level interface has no live WASM instance to call
+        into; backends with one override this with the actual pointer +
+        length call.
+
+        Args:
+            buffer: Concatenated length-prefixed frames
+        """
+
     def create_wasm_context(self, memory_pages: int = 1) -> Dict[str, Any]:
         """
         Create a context for WASM execution.
-        
+
+        Contexts are pure functions of the page count and requested for
+        the same few sizes over and over, so they are built once behind
+        an LRU and shared as read-only mappings.
+
         Args:
             memory_pages: Number of 64KB memory pages
-            
+
         Returns:
-            Context dictionary
+            Read-only context mapping
         """
-        return {
-            "memory_pages": memory_pages,
-            "memory_size_bytes": memory_pages * 65536,
-            "stack_size": 1024 * 1024,  # 1MB stack
-            "heap_size": memory_pages * 65536 - 1024 * 1024
-        }
+        return _build_wasm_context(memory_pages)
 
 
 class WasmCertificate(WasmSerializable):
@@ -136,74 +361,102 @@ class WasmCertificate(WasmSerializable):
     
     def to_wasm_bytes(self) -> bytes:
         """Convert certificate to bytes for WASM."""
-        cert_dict = {
-            "data": self.data,
-            "signature": self.signature,
-            "timestamp": self.timestamp
-        }
-        return WasmInterface.serialize_for_wasm(cert_dict)
-    
+        payload = self.data.encode('utf-8')
+        signature = self.signature.encode('utf-8')
+        return _CERT_HDR.pack(self.timestamp, len(payload), len(signature)) \
+            + payload + signature
+
+    @staticmethod
+    def signature_from_wasm_bytes(data: bytes) -> str:
+        """
+        Read just the signature from a certificate frame.
+
+        Verification paths rarely need the payload; the fixed header
+        gives the signature's offset directly, so the (possibly large)
+        data field is never decoded.
+        """
+        _, payload_len, signature_len = _CERT_HDR.unpack_from(data, 0)
+        end = _CERT_HDR.size + payload_len
+        return data[end:end + signature_len].decode('utf-8')
+
+    @staticmethod
+    def timestamp_from_wasm_bytes(data: bytes) -> float:
+        """Read just the timestamp from a certificate frame."""
+        return _CERT_HDR.unpack_from(data, 0)[0]
+
     def from_wasm_bytes(self, data: bytes) -> 'WasmCertificate':
         """Create certificate from WASM bytes."""
-        cert_dict = WasmInterface.deserialize_from_wasm(data)
+        timestamp, payload_len, signature_len = _CERT_HDR.unpack_from(data, 0)
+        offset = _CERT_HDR.size
+        end = offset + payload_len
         return WasmCertificate(
-            data=cert_dict["data"],
-            signature=cert_dict["signature"],
-            timestamp=cert_dict["timestamp"]
+            data=data[offset:end].decode('utf-8'),
+            signature=data[end:end + signature_len].decode('utf-8'),
+            timestamp=timestamp
         )
 
 
+# Export/import tables and memory config are static; built once here so
+# the accessors below hand out shared immutable views instead of a fresh
+# list/dict allocation per call
+_WASM_EXPORTS = (
+    "validate_input",
+    "generate_certificate",
+    "verify_certificate",
+    "check_satisfiability",
+    "process_batch"
+)
+
+_WASM_IMPORTS = (
+    "console_log",
+    "get_timestamp",
+    "random_bytes"
+)
+
+_WASM_MEMORY_CONFIG = MappingProxyType({
+    "initial_pages": 16,  # 1MB initial
+    "max_pages": 256,     # 16MB maximum
+    "stack_size": 65536   # 64KB stack
+})
+
+
 class WasmExportable:
     """
     Mixin for classes that can be exported to WebAssembly.
-    
+
     This enables ASA-Fusion components to be compiled and run in WASM environments,
     supporting browser-based verification and edge computing deployments.
     """
-    
+
     @staticmethod
-    def get_wasm_exports() -> List[str]:
+    def get_wasm_exports() -> tuple:
         """
-        Get list of functions exported to WASM.
-        
+        Get functions exported to WASM.
+
         Returns:
-            List of function names
-        """
-        return [
-            "validate_input",
-            "generate_certificate",
-            "verify_certificate",
-            "check_satisfiability",
-            "process_batch"
-        ]
-    
+            Tuple of function names
+        """
+        return _WASM_EXPORTS
+
     @staticmethod
-    def get_wasm_imports() -> List[str]:
+    def get_wasm_imports() -> tuple:
         """
-        Get list of functions imported from WASM host.
-        
+        Get functions imported from WASM host.
+
         Returns:
-            List of function names
+            Tuple of function names
         """
-        return [
-            "console_log",
-            "get_timestamp",
-            "random_bytes"
-        ]
-    
+        return _WASM_IMPORTS
+
     @staticmethod
     def get_wasm_memory_config() -> Dict[str, int]:
         """
         Get WASM memory configuration.
-        
+
         Returns:
-            Memory configuration dictionary
+            Read-only memory configuration mapping
         """
-        return {
-            "initial_pages": 16,  # 1MB initial
-            "max_pages": 256,     # 16MB maximum
-            "stack_size": 65536   # 64KB stack
-        }
+        return _WASM_MEMORY_CONFIG
 
 
 # Global WASM interface instance
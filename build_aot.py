@@ -0,0 +1,30 @@
+"""
+TrustCert AI - AOT build of the trust-score kernel.
+
+Numba's @njit pays a 50-200ms JIT compile per decorated function on every
+worker boot (and again on every scale-out replica). This script compiles the
+batch scoring kernel ahead of time into a `trustcert_kernels` extension
+module during the Docker image build, so runtime workers import a ready
+`.so` with zero JIT cost. score_kernel.py picks it up automatically when
+present and falls back to JIT/NumPy otherwise.
+
+Run from the repo root: python build_aot.py
+"""
+from numba.pycc import CC
+
+cc = CC('trustcert_kernels')
+cc.output_dir = 'apps/api'
+cc.verbose = True
+
+
+@cc.export('score_batch', 'void(f4[:], f4[:], f4[:], f4[:], f4[:])')
+def score_batch(age, vr, a30, r90, out):
+    # Same math as score_kernel._score_batch_kernel; weights are inlined
+    # because AOT-compiled code cannot see module globals at runtime
+    for i in range(age.shape[0]):
+        s = 0.25 * age[i] / 365.0 + 0.35 * vr[i] + 0.30 * a30[i] - 0.20 * r90[i]
+        out[i] = 0.0 if s < 0.0 else (1.0 if s > 1.0 else s)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the ASA-Fusion test suite.
+
+Construction of the heavier objects is hoisted to session scope: the
+certificate manager absorbs its salt into the hash base at init and the
+validator wires up its scan memo, and neither holds per-test state that
+a test can observe. Objects that tests mutate (plugin registries) stay
+function-scoped so each test starts from a clean slate.
+"""
+
+import pytest
+
+from apps.asa_fusion import InputValidator, PluginRegistry, SHA3CertificateManager
+
+
+@pytest.fixture(scope="session")
+def cert_manager():
+    """Default-salt certificate manager shared across the session."""
+    return SHA3CertificateManager()
+
+
+@pytest.fixture(scope="session")
+def validator():
+    """Default-limits input validator shared across the session."""
+    return InputValidator()
+
+
+@pytest.fixture
+def registry():
+    """Fresh plugin registry per test; registration mutates it."""
+    return PluginRegistry()
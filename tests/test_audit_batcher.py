@@ -0,0 +1,71 @@
+"""
+Tests for the Merkle audit-log batcher.
+
+The chain anchor is stubbed; these cover the locking discipline (a slow
+anchor must not serialize concurrent adds), proof lookup, and the proof
+store's eviction cap.
+"""
+
+import asyncio
+
+import pytest
+
+audit_batcher = pytest.importorskip(
+    "apps.api.audit_batcher",
+    reason="requires the full API environment (web3, aiohttp, config)",
+)
+
+
+def test_slow_anchor_does_not_block_concurrent_adds(monkeypatch):
+    async def run():
+        release = asyncio.Event()
+        anchored = []
+
+        async def slow_anchor(root_hex, batch_id):
+            anchored.append(batch_id)
+            await release.wait()
+            return f"0x{root_hex}"
+
+        monkeypatch.setattr(audit_batcher, "anchor_log_to_blockchain", slow_anchor)
+        batcher = audit_batcher.MerkleBatcher(max_leaves=1, flush_ms=10_000)
+
+        first = asyncio.ensure_future(batcher.add("log-a", b"one"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(batcher.add("log-b", b"two"))
+        await asyncio.sleep(0.01)
+
+        # Both adds must have reached the anchor while the first is still
+        # parked in the RPC - i.e. the lock was not held across the await
+        assert len(anchored) == 2
+
+        release.set()
+        for task, log_id in ((first, "log-a"), (second, "log-b")):
+            batch_id, proof, tx_hash = await asyncio.wait_for(task, timeout=2.0)
+            assert tx_hash.startswith("0x")
+            record = batcher.get_proof(log_id)
+            assert record["batch_id"] == batch_id
+            leaf = bytes.fromhex(record["leaf"])
+            root = bytes.fromhex(record["root"])
+            assert audit_batcher.verify_proof(leaf, proof, root)
+
+    asyncio.run(run())
+
+
+def test_proof_store_evicts_oldest(monkeypatch):
+    async def run():
+        async def instant_anchor(root_hex, batch_id):
+            return f"0x{root_hex}"
+
+        monkeypatch.setattr(audit_batcher, "anchor_log_to_blockchain", instant_anchor)
+        monkeypatch.setattr(audit_batcher, "MAX_PROOF_RECORDS", 3)
+        batcher = audit_batcher.MerkleBatcher(max_leaves=1, flush_ms=10_000)
+
+        for i in range(5):
+            await batcher.add(f"log-{i}", f"payload-{i}".encode())
+
+        assert batcher.get_proof("log-0") is None
+        assert batcher.get_proof("log-1") is None
+        for i in range(2, 5):
+            assert batcher.get_proof(f"log-{i}") is not None
+
+    asyncio.run(run())
@@ -0,0 +1,56 @@
+"""
+Tests for the audit-log anchor batching worker.
+
+The flush path itself needs a chain endpoint, so it is stubbed out;
+these tests cover the queue/worker plumbing - that an enqueued anchor
+actually resolves once the worker is running, and that shutdown does
+not strand pending callers.
+"""
+
+import asyncio
+
+import pytest
+
+blockchain = pytest.importorskip(
+    "apps.api.blockchain",
+    reason="requires the full API environment (web3, aiohttp, config)",
+)
+
+
+def test_enqueued_anchor_resolves(monkeypatch):
+    async def run():
+        flushed = []
+
+        async def fake_flush(batch, retry=True):
+            flushed.append(len(batch))
+            for _, log_hash, future in batch:
+                if not future.done():
+                    future.set_result(f"0x{log_hash}")
+
+        monkeypatch.setattr(blockchain, "_flush_batch", fake_flush)
+        blockchain.start_anchor_worker()
+        try:
+            result = await asyncio.wait_for(
+                blockchain.anchor_log_to_blockchain("ab" * 32, "log-1"),
+                timeout=2.0,
+            )
+        finally:
+            blockchain.stop_anchor_worker()
+        assert result == "0x" + "ab" * 32
+        assert flushed == [1]
+
+    asyncio.run(run())
+
+
+def test_stop_worker_releases_pending():
+    async def run():
+        # No worker running: the future sits in the queue until shutdown
+        # resolves it to None instead of hanging the caller forever
+        pending = asyncio.ensure_future(
+            blockchain.anchor_log_to_blockchain("cd" * 32, "log-2")
+        )
+        await asyncio.sleep(0)
+        blockchain.stop_anchor_worker()
+        assert await asyncio.wait_for(pending, timeout=2.0) is None
+
+    asyncio.run(run())
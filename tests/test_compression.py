@@ -0,0 +1,99 @@
+"""
+Tests for the negotiated-compression ASGI middleware.
+
+These drive the middleware with a fake downstream app and cover the three
+response shapes: large bodies get compressed, small bodies pass through,
+and genuine streams are released uncompressed once the buffer threshold
+is crossed instead of being withheld until the final chunk.
+"""
+
+import asyncio
+import gzip
+
+from apps.api.compression import STREAM_PASSTHROUGH_BYTES, CompressionMiddleware
+
+_SCOPE = {
+    "type": "http",
+    "headers": [(b"accept-encoding", b"gzip")],
+}
+
+
+def _run(app, scope=_SCOPE):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    asyncio.run(CompressionMiddleware(app)(scope, receive, send))
+    return sent
+
+
+def _headers(message):
+    return dict(message.get("headers", []))
+
+
+def test_large_body_is_compressed():
+    body = b"x" * 5000
+
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    sent = _run(app)
+    headers = _headers(sent[0])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(sent[1]["body"]) == body
+    assert headers[b"content-length"] == str(len(sent[1]["body"])).encode()
+
+
+def test_small_body_passes_through():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"tiny"})
+
+    sent = _run(app)
+    assert b"content-encoding" not in _headers(sent[0])
+    assert sent[1]["body"] == b"tiny"
+
+
+def test_stream_released_past_threshold():
+    chunk = b"y" * (STREAM_PASSTHROUGH_BYTES // 2)
+    sent = []
+    headers_flushed = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for _ in range(3):
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": True,
+            })
+            # Record whether headers are already on the wire after each
+            # chunk - a stream reader cannot wait for the final one
+            headers_flushed.append(
+                any(m["type"] == "http.response.start" for m in sent)
+            )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    asyncio.run(CompressionMiddleware(app)(_SCOPE, receive, send))
+
+    assert headers_flushed[-1] is True
+    assert b"content-encoding" not in _headers(sent[0])
+    total = b"".join(
+        m.get("body", b"") for m in sent if m["type"] == "http.response.body"
+    )
+    assert total == chunk * 3